@@ -0,0 +1,137 @@
+# ---------------------------------------------------------------------------- #
+#                                                                              #
+# 	Module:       main.py                                                      #
+# 	Author:       Alex Oh, Alp Tanyel, Andrei Mitchell                         #
+# 	Created:      10/18/2026                                                   #
+# 	Description:  Kinematic calibration of the drivetrain                      #
+#                                                                              #
+# ---------------------------------------------------------------------------- #
+
+# Library imports
+from vex import *
+from robot import *     # lib/robot.py, bundled in by sim/build.py
+
+# Kinematic calibration: measures the effective wheel diameter of each side
+# and the effective track width and saves them to calibration.txt on the SD
+# card, where every assignment loads them at startup.
+#
+# Put tape on the floor CALIBRATION_DISTANCE ahead of the robot's front and
+# press the bump switch. The robot drives slowly straight ahead on the
+# inertial sensor; press the bump switch again as its front crosses the tape.
+# The encoder degrees each side turned over that known distance give its
+# wheel diameter. The robot then spins SPIN_TURNS full turns each way in
+# place, and the wheel travel against the inertial sensor's rotation gives
+# the track width, including any wheel scrub.
+CALIBRATION_DISTANCE = 48   # Inches from the start to the tape
+CALIBRATION_VELOCITY = 20   # Percent; slow enough to press the switch on the line
+OVERRUN = 1.5               # Stop if there is no press by this times the distance
+EARLIEST = 0.5              # Presses before this fraction of the distance are stray
+SPIN_TURNS = 2              # Full turns each way
+SPIN_VELOCITY = 30
+
+# Drive straight until the bump switch is pressed; returns the encoder
+# degrees each side turned, or None if the robot went too far first.
+# A press that starts before EARLIEST of the way is ignored, so brushing
+# the switch after the start can't give a tiny count and a huge wheel.
+def measureDrive():
+    count = OVERRUN * CALIBRATION_DISTANCE / calibration.inchesPerDegree()
+    earliest = EARLIEST * CALIBRATION_DISTANCE / calibration.inchesPerDegree()
+    sensors.zeroEncoders()
+    hold = PID(HEADING_KP, HEADING_KI, HEADING_KD, outputLimit=CALIBRATION_VELOCITY / 4)
+    profile = MotionProfile(count, CALIBRATION_VELOCITY * PERCENT_DPS, DRIVE_ACCEL, DRIVE_JERK)
+    loop = ControlLoop()
+    released = not sensors.bumper   # Ignore the press that started the run
+    travelled = None
+
+    while (abs(sensors.right) + abs(sensors.left)) / 2 < count:
+        position = (abs(sensors.right) + abs(sensors.left)) / 2
+        pressed = sensors.bumper
+        if pressed and released and position >= earliest:
+            travelled = (abs(sensors.right), abs(sensors.left))
+            break
+        released = not pressed      # A press counts from when it starts
+
+        velocity = profile.command(loop.elapsed(), position)
+        accel = profile.acceleration(loop.elapsed()) / PERCENT_DPS
+        correction = hold.update(targetRotation, sensors.rotation, sensors.time)
+        spinMotors(velocity - correction, velocity + correction, accel, accel)
+        loop.tick()
+
+    stopMotors()
+    loop.report("measureDrive")
+    return travelled
+
+# Spin in place both ways; returns the effective track width in inches
+def measureSpins(rightDiameter, leftDiameter):
+    wheels = 0.0        # Inches the wheels travelled
+    turned = 0.0        # Radians the robot turned
+    for direction in (1, -1):
+        sensors.zeroEncoders()
+        sensors.start()
+        start = sensors.rotation
+        gyroTurn(360 * SPIN_TURNS, SPIN_VELOCITY, direction)
+        settle()
+        sensors.update()
+        wheels += (abs(sensors.right) * math.pi * rightDiameter
+                   + abs(sensors.left) * math.pi * leftDiameter) / 360
+        turned += math.radians(abs(sensors.rotation - start))
+    if turned <= 0:
+        return 0        # The inertial sensor saw no turn; fails the limits
+    return wheels / turned
+
+def show(row, text):
+    brain.screen.clear_row(row)
+    brain.screen.set_cursor(row, 1)
+    brain.screen.print(text)
+
+# Measure the wheels and track width and save them
+def calibrate():
+    resetPose()
+    show(1, "Press at %d in" % CALIBRATION_DISTANCE)
+    travelled = measureDrive()
+    if travelled is None or min(travelled) <= 0:
+        show(1, "No press: not saved")
+        print("No bump press within %.0f in: calibration not saved" % (OVERRUN * CALIBRATION_DISTANCE))
+        return
+    settle()
+
+    rightDiameter = CALIBRATION_DISTANCE * 360 / (math.pi * travelled[0])
+    leftDiameter = CALIBRATION_DISTANCE * 360 / (math.pi * travelled[1])
+    show(1, "Spinning")
+    trackWidth = measureSpins(rightDiameter, leftDiameter)
+
+    show(2, "Wheels R %.3f L %.3f" % (rightDiameter, leftDiameter))
+    show(3, "Track width %.2f" % trackWidth)
+    bad = implausible({"rightDiameter": rightDiameter, "leftDiameter": leftDiameter,
+                       "trackWidth": trackWidth})
+    if bad:
+        # Keep the values in use; a bad measurement would throw off the next run
+        show(1, "Implausible: not saved")
+        print("Implausible %s: calibration not saved" % ", ".join(bad))
+        return
+
+    calibration.rightDiameter = rightDiameter
+    calibration.leftDiameter = leftDiameter
+    calibration.trackWidth = trackWidth
+    if brain.sdcard.is_inserted():
+        calibration.save()
+        show(1, "Saved")
+    else:
+        show(1, "No SD card: not saved")
+    print(calibration.describe())
+
+def main():
+    # Set stopping mode for motors
+    rightMotor.set_stopping(BRAKE)
+    leftMotor.set_stopping(BRAKE)
+    calibration.load()              # Measure with the current values as a start
+
+    calibrateInertial()             # Robot must be still while this runs
+
+    while True:
+        bump()                          # Wait for bump switch to be pressed
+
+        wait(0.5, SECONDS)            # Wait so robot is not affected by hand
+        calibrate()
+
+main()  # Run main function
@@ -0,0 +1,118 @@
+# ---------------------------------------------------------------------------- #
+#                                                                              #
+# 	Module:       main.py                                                      #
+# 	Author:       Alex Oh, Alp Tanyel, Andrei Mitchell                         #
+# 	Created:      10/18/2026                                                   #
+# 	Description:  Drivetrain characterization runs                             #
+#                                                                              #
+# ---------------------------------------------------------------------------- #
+
+# Library imports
+from vex import *
+import struct
+from robot import *     # lib/robot.py, bundled in by sim/build.py
+
+# Drivetrain characterization: on each bump the drive motors are run open
+# loop in voltage mode and their applied volts, encoders and speeds are
+# logged every CHARACTERIZE_PERIOD to characterize.bin on the SD card. The
+# ramps are slow enough that acceleration hardly matters, which pins down kS
+# and kV; the steps accelerate hard for kA, and the spins give the track
+# width. Fit the log with sim/characterize.py. Each test drives back over the
+# one before, but leave about 3 feet clear all round.
+CHARACTERIZE_PERIOD = 5     # Milliseconds between samples
+RAMP_RATE = 1               # Volts per second
+RAMP_TIME = 4               # Seconds
+STEP_VOLTS = 6
+STEP_TIME = 1               # Seconds
+STOP_TIMEOUT = 1            # Seconds to log the robot coming to a stop
+STOP_SPEED = 1              # Motor degrees per second that counts as stopped
+
+# Record (little endian, 34 bytes): time in microseconds, test number, 1
+# while the test drives and 0 while the robot comes to a stop, then right and
+# left applied volts, encoder degrees and motor degrees per second, and the
+# inertial rotation in degrees.
+CHARACTERIZE_FORMAT = "<IBB7f"
+CHARACTERIZE_RECORD = struct.calcsize(CHARACTERIZE_FORMAT)
+CHARACTERIZE_HEADER = "<4sHH"   # b"VXCH", format version, record size
+CHARACTERIZE_FILE = "characterize.bin"
+
+# Tests in the order they run: right and left directions, and whether the
+# volts step straight up instead of ramping
+TESTS = [
+    (1, 1, False),      # Ramp forward
+    (-1, -1, False),    # Ramp backward
+    (1, 1, True),       # Step forward
+    (-1, -1, True),     # Step backward
+    (1, -1, False),     # Spin left
+    (-1, 1, False),     # Spin right
+]
+
+# Run one test and log it until the robot has stopped; returns the records
+def runTest(number, right, left, step):
+    records = bytearray()
+    duration = STEP_TIME if step else RAMP_TIME
+    loop = ControlLoop(CHARACTERIZE_PERIOD)
+    driving = True
+
+    while loop.elapsed() < duration + STOP_TIMEOUT:
+        # Read back what the motors were doing before this tick's command
+        rightVolts = rightMotor.voltage(VOLT)
+        leftVolts = leftMotor.voltage(VOLT)
+        rightSpeed = rightMotor.velocity(DPS)
+        leftSpeed = leftMotor.velocity(DPS)
+        if not driving and abs(rightSpeed) < STOP_SPEED and abs(leftSpeed) < STOP_SPEED:
+            break
+        records += struct.pack(CHARACTERIZE_FORMAT, sensors.time & 0xFFFFFFFF, number, driving,
+                               rightVolts, leftVolts, sensors.right, sensors.left,
+                               rightSpeed, leftSpeed, sensors.rotation)
+
+        if loop.elapsed() < duration:
+            volts = STEP_VOLTS if step else RAMP_RATE * loop.elapsed()
+            motorCommands.spin(rightMotor, right * volts, VOLT)
+            motorCommands.spin(leftMotor, left * volts, VOLT)
+        elif driving:
+            stopMotors()
+            driving = False
+        loop.tick()
+
+    stopMotors()
+    loop.report("test %d" % number)
+    return records
+
+# Run every test and save the log
+def characterize():
+    saving = brain.sdcard.is_inserted()
+    if saving:
+        brain.sdcard.savefile(CHARACTERIZE_FILE, bytearray(
+            struct.pack(CHARACTERIZE_HEADER, b"VXCH", 1, CHARACTERIZE_RECORD)))
+    else:
+        print("No SD card: nothing will be logged")
+
+    sensors.zeroEncoders()
+    for number, (right, left, step) in enumerate(TESTS):
+        brain.screen.clear_row(1)
+        brain.screen.set_cursor(1, 1)
+        brain.screen.print("Test %d of %d" % (number + 1, len(TESTS)))
+        records = runTest(number + 1, right, left, step)
+        if saving:
+            brain.sdcard.appendfile(CHARACTERIZE_FILE, records)
+        settle()
+
+    brain.screen.clear_row(1)
+    brain.screen.set_cursor(1, 1)
+    brain.screen.print("Done" if saving else "Done, no SD card")
+
+def main():
+    # Set stopping mode for motors
+    rightMotor.set_stopping(BRAKE)
+    leftMotor.set_stopping(BRAKE)
+
+    calibrateInertial()             # Robot must be still while this runs
+
+    while True:
+        bump()                          # Wait for bump switch to be pressed
+
+        wait(0.5, SECONDS)            # Wait so robot is not affected by hand
+        characterize()
+
+main()  # Run main function
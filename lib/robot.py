@@ -0,0 +1,1471 @@
+# ---------------------------------------------------------------------------- #
+#                                                                              #
+# 	Module:       robot.py                                                     #
+# 	Author:       Alex Oh, Alp Tanyel, Andrei Mitchell                         #
+# 	Created:      10/18/2026                                                   #
+# 	Description:  Robot library shared by the assignments                      #
+#                                                                              #
+# ---------------------------------------------------------------------------- #
+
+# Every assignment's main.py starts with "from robot import *". The brain
+# only runs a single file, so sim/build.py copies in the parts of this file a
+# main.py uses before it is downloaded, and the simulator does the same.
+
+# Library imports
+from vex import *
+import struct
+
+# Brain should be defined by default
+brain=Brain()
+
+# Robot configuration code
+rightMotor = Motor(Ports.PORT1, GearSetting.RATIO_18_1, False)
+leftMotor = Motor(Ports.PORT2, GearSetting.RATIO_18_1, True)
+liftMotor = Motor(Ports.PORT3, GearSetting.RATIO_18_1, False)
+inertial_1 = Inertial(Ports.PORT5)
+liftArmRotation = Rotation(Ports.PORT6, False)
+bumpSwitch = Bumper(brain.three_wire_port.a)
+
+# Device call profiling: with PROFILE = True every call the code makes on the
+# devices above is timed, per method and per calling function, and bump()
+# prints a summary when a run ends. A timed call costs two extra timer reads,
+# and the time of one is taken back out of each measurement.
+PROFILE = False
+PROFILE_ROWS = 15       # Rows in the summary
+
+class Profiler:
+    def __init__(self):
+        self.clock = brain.timer.system_high_res    # Never profiled itself
+        start = self.clock()
+        self.overhead = self.clock() - start        # Microseconds one timer read adds
+        self.caller = "main"            # Function the device calls are charged to
+        self.stats = {}                 # (caller, method) -> [calls, total us, max us]
+
+    def add(self, method, elapsed):
+        key = (self.caller, method)
+        entry = self.stats.get(key)
+        if entry is None:
+            self.stats[key] = [1, elapsed, elapsed]
+            return
+        entry[0] += 1
+        entry[1] += elapsed
+        if elapsed > entry[2]:
+            entry[2] = elapsed
+
+    # Print the calls that took the most time in total, then start over
+    def report(self):
+        if not self.stats:
+            return
+        rows = sorted(self.stats.items(), key=lambda item: item[1][1], reverse=True)
+        calls = sum(entry[0] for entry in self.stats.values())
+        total = sum(entry[1] for entry in self.stats.values())
+        print("Device calls: %d, %.1f ms" % (calls, total / 1000))
+        for (caller, method), (count, spent, longest) in rows[:PROFILE_ROWS]:
+            print("  %-18s %-28s %6d calls %8.1f ms  avg %4d us  max %5d us" % (
+                caller, method, count, spent / 1000, spent / count, longest))
+        self.stats = {}
+
+profiler = Profiler()
+
+# Stand-in for a device: each method is wrapped in a timer the first time it
+# is looked up. children names attributes holding further devices.
+class ProfiledDevice:
+    def __init__(self, device, name, children=()):
+        self.device = device
+        self.name = name
+        for child in children:
+            setattr(self, child, ProfiledDevice(getattr(device, child), name + "." + child))
+
+    def __getattr__(self, attr):
+        value = getattr(self.device, attr)
+        if not callable(value):
+            return value
+        method = self.name + "." + attr
+        clock = profiler.clock
+
+        def timed(*args, **kwargs):
+            start = clock()
+            result = value(*args, **kwargs)
+            profiler.add(method, max(0, clock() - start - profiler.overhead))
+            return result
+
+        setattr(self, attr, timed)      # Later lookups skip __getattr__
+        return timed
+
+# Charge device calls made inside a function to that function
+def profiled(function):
+    if not PROFILE:
+        return function
+    name = function.__name__
+
+    def wrapper(*args, **kwargs):
+        outer = profiler.caller
+        profiler.caller = name
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profiler.caller = outer
+    return wrapper
+
+if PROFILE:
+    rightMotor = ProfiledDevice(rightMotor, "rightMotor")
+    leftMotor = ProfiledDevice(leftMotor, "leftMotor")
+    liftMotor = ProfiledDevice(liftMotor, "liftMotor")
+    inertial_1 = ProfiledDevice(inertial_1, "inertial_1")
+    liftArmRotation = ProfiledDevice(liftArmRotation, "liftArmRotation")
+    bumpSwitch = ProfiledDevice(bumpSwitch, "bumpSwitch")
+    brain = ProfiledDevice(brain, "brain", ("screen", "timer", "battery", "sdcard"))
+
+# Control loop period in milliseconds
+LOOP_PERIOD = 10
+
+# Fixed-rate control loop: call tick() once at the end of every pass. Spare
+# time in a tick goes to the screen and the SD card log, and each tick ends
+# with a fresh sensor snapshot. The log is only written while no other loop
+# is running, since a write can't fit around two loops' deadlines.
+loopTicks = {}          # Snapshot id -> time its loop last ticked, in microseconds
+
+class ControlLoop:
+    def __init__(self, period=LOOP_PERIOD, snapshot=None, rates=False):
+        self.sensors = snapshot or sensors  # Snapshot this loop keeps up to date
+        self.rates = rates              # Also sample the device speeds
+        self.period = period * 1000     # Tick length in microseconds
+        self.ticks = 0                  # Passes completed
+        self.overruns = 0               # Passes that ran past their tick
+        self.totalJitter = 0            # Wake-up error in microseconds
+        self.maxJitter = 0
+        self.start = brain.timer.system_high_res()
+        self.next = self.start + self.period
+        self.caller = profiler.caller   # Other threads may run while this one waits
+        self.sent = motorCommands.sent  # Motor command counts when the loop started
+        self.suppressed = motorCommands.suppressed
+        self.sensors.start(self.rates)
+
+    def tick(self):
+        self.ticks += 1
+        now = brain.timer.system_high_res()
+        loopTicks[id(self.sensors)] = now
+        if now < self.next:
+            telemetry.service(now)
+            if not self.othersRunning(now):
+                telemetryLog.service(brain.timer.system_high_res(), self.next)
+            now = brain.timer.system_high_res()
+
+        # Overran: start the next pass now and skip the ticks that were missed
+        if now >= self.next:
+            self.overruns += 1
+            self.next += ((now - self.next) // self.period + 1) * self.period
+            self.update()
+            return
+
+        wait((self.next - now) / 1000, MSEC)
+        profiler.caller = self.caller
+        jitter = abs(brain.timer.system_high_res() - self.next)
+        self.totalJitter += jitter
+        self.maxJitter = max(self.maxJitter, jitter)
+        self.next += self.period
+        self.update()
+
+    def update(self):
+        self.sensors.update(self.rates)
+        telemetryLog.record(self.sensors)
+
+    # True if a loop on another snapshot has ticked within two periods
+    def othersRunning(self, now):
+        for key in loopTicks:
+            if key != id(self.sensors) and now - loopTicks[key] < 2 * self.period:
+                return True
+        return False
+
+    # Seconds from the start of the loop to the latest sensor snapshot
+    def elapsed(self):
+        return (self.sensors.time - self.start) / 1000000
+
+    # Print tick statistics to the console
+    def report(self, name):
+        onTime = max(1, self.ticks - self.overruns)
+        print("%s: %d ticks, %d overruns, jitter avg %d us, max %d us, %d commands sent, %d skipped" % (
+            name, self.ticks, self.overruns, self.totalJitter / onTime, self.maxJitter,
+            motorCommands.sent - self.sent, motorCommands.suppressed - self.suppressed))
+
+# Sensor snapshot: every device is read once per control tick and the
+# control code works from that copy, so all comparisons in a pass agree
+class SensorSnapshot:
+    def __init__(self):
+        self.time = 0           # Sample time in microseconds
+        self.deltaTime = 0      # Seconds since the previous sample
+        self.right = 0          # Drive encoders in degrees
+        self.left = 0
+        self.lift = 0           # Lift arm angle in degrees
+        self.heading = 0        # Inertial heading and rotation in degrees
+        self.rotation = 0
+        self.bumper = False
+        self.rightZero = 0      # Raw encoder counts where the current move started
+        self.leftZero = 0
+        self.rightSpeed = 0     # Degrees per second between the last two samples
+        self.leftSpeed = 0
+        self.liftSpeed = 0
+        self.turnRate = 0
+        self.rightVelocity = 0  # Speeds the devices report, in degrees per second,
+        self.leftVelocity = 0   # for feedforward and settling
+        self.gyroRate = 0
+        self.liftVelocity = 0
+
+    # Sample every device; the device speeds only when asked for, or when
+    # the drive feedforward needs the wheels'
+    def update(self, rates=False):
+        prevTime = self.time
+        prevRight = self.right
+        prevLeft = self.left
+        prevLift = self.lift
+        prevRotation = self.rotation
+
+        self.time = brain.timer.system_high_res()
+        self.right = rightMotor.position(DEGREES) - self.rightZero
+        self.left = leftMotor.position(DEGREES) - self.leftZero
+        self.lift = liftArmRotation.position(DEGREES)
+        self.heading = inertial_1.heading(DEGREES)
+        self.rotation = inertial_1.rotation(DEGREES)
+        self.bumper = bumpSwitch.pressing()
+        # The devices' own speeds; differencing positions a tick apart is too noisy
+        if rates or DRIVE_KV is not None:
+            self.rightVelocity = rightMotor.velocity(DPS)
+            self.leftVelocity = leftMotor.velocity(DPS)
+        if rates:
+            self.gyroRate = inertial_1.gyro_rate(ZAXIS, DPS)
+            self.liftVelocity = liftArmRotation.velocity(DPS)
+
+        self.deltaTime = (self.time - prevTime) / 1000000
+        if self.deltaTime > 0:
+            self.rightSpeed = (self.right - prevRight) / self.deltaTime
+            self.leftSpeed = (self.left - prevLeft) / self.deltaTime
+            self.liftSpeed = (self.lift - prevLift) / self.deltaTime
+            self.turnRate = (self.rotation - prevRotation) / self.deltaTime
+
+    # Measure the drive encoders from here on. The motors themselves are never
+    # reset, so odometry keeps counting across moves.
+    def zeroEncoders(self):
+        self.rightZero = rightMotor.position(DEGREES)
+        self.leftZero = leftMotor.position(DEGREES)
+
+    # Sample without speeds, e.g. right after the encoders were zeroed
+    def start(self, rates=False):
+        self.update(rates)
+        self.deltaTime = 0
+        self.rightSpeed = 0
+        self.leftSpeed = 0
+        self.liftSpeed = 0
+        self.turnRate = 0
+
+# The lift's own snapshot, so it can run beside a drive move. Only the lift
+# arm is read; the drive fields are copied from the drive's snapshot for the
+# log, so a lift beside a drive doesn't read every device twice a tick.
+class LiftSnapshot(SensorSnapshot):
+    def update(self, rates=False):
+        prevTime = self.time
+        prevLift = self.lift
+
+        self.time = brain.timer.system_high_res()
+        self.lift = liftArmRotation.position(DEGREES)
+        if rates:
+            self.liftVelocity = liftArmRotation.velocity(DPS)
+        self.right = sensors.right
+        self.left = sensors.left
+        self.rightZero = sensors.rightZero
+        self.leftZero = sensors.leftZero
+        self.heading = sensors.heading
+        self.rotation = sensors.rotation
+        self.bumper = sensors.bumper
+        self.rightVelocity = sensors.rightVelocity
+        self.leftVelocity = sensors.leftVelocity
+        self.gyroRate = sensors.gyroRate
+
+        self.deltaTime = (self.time - prevTime) / 1000000
+        if self.deltaTime > 0:
+            self.liftSpeed = (self.lift - prevLift) / self.deltaTime
+
+sensors = SensorSnapshot()
+liftSensors = LiftSnapshot()
+
+# Screen refresh period in milliseconds
+SCREEN_PERIOD = 100
+
+# Screen telemetry: set() only records a value, and the screen is redrawn at
+# most once per SCREEN_PERIOD with just the fields whose text changed
+class ScreenTelemetry:
+    def __init__(self, period=SCREEN_PERIOD):
+        self.period = period * 1000     # Microseconds between redraws
+        self.nextDraw = 0
+        self.fields = {}                # name -> [row, column, label, value]
+        self.shown = {}                 # name -> text currently on the screen
+
+    # Add a labelled field at a screen position
+    def field(self, name, row, col, label=""):
+        self.fields[name] = [row, col, label, ""]
+
+    def set(self, name, value):
+        self.fields[name][3] = value
+
+    # Redraw the fields that changed since the last draw
+    def draw(self):
+        for name in self.fields:
+            row, col, label, value = self.fields[name]
+            if isinstance(value, float):
+                value = "%.2f" % value
+            text = label + str(value)
+            shown = self.shown.get(name, "")
+            if text != shown:
+                brain.screen.set_cursor(row, col)
+                brain.screen.print(text + " " * (len(shown) - len(text)))
+                self.shown[name] = text
+        self.nextDraw = brain.timer.system_high_res() + self.period
+
+    # Redraw if the refresh period has passed
+    def service(self, now):
+        if now >= self.nextDraw:
+            self.draw()
+
+telemetry = ScreenTelemetry()
+
+# Telemetry log: every control tick packs one fixed-size binary record into a
+# ring buffer allocated up front, and whole chunks are appended to the SD card
+# when a tick has time to spare or the robot is waiting on the bump switch.
+# When two control loops run at once only one of them logs each tick.
+# Record (little endian, 24 bytes): time in microseconds, right and left
+# encoder degrees, commanded right and left velocity in hundredths of a
+# percent, inertial rotation and lift arm angle in degrees.
+LOG_FORMAT = "<Iffhhff"     # Also in sim/telemetry.py; sim/test_telemetry.py ties them
+LOG_RECORD = struct.calcsize(LOG_FORMAT)
+LOG_HEADER = "<4sHH"    # b"VXTL", format version, record size
+LOG_RECORDS = 1024      # Records the ring holds, about 10 s at loop rate
+LOG_CHUNK = 64          # Records per SD card write
+LOG_WRITE_TIME = 2000   # Microseconds an SD card append takes, plus
+LOG_BYTE_TIME = 1       # microseconds per byte written
+LOG_SLACK = LOG_WRITE_TIME + LOG_CHUNK * LOG_RECORD * LOG_BYTE_TIME  # To fit a chunk in a tick
+LOG_FILE = "telemetry.bin"
+
+class TelemetryLog:
+    def __init__(self, capacity=LOG_RECORDS):
+        self.capacity = capacity
+        self.buffer = bytearray(capacity * LOG_RECORD)
+        self.view = memoryview(self.buffer)
+        self.filename = LOG_FILE
+        self.saving = False             # True once a log file is open
+        self.head = 0                   # Records written since begin()
+        self.flushed = 0                # Records saved to the SD card
+        self.dropped = 0                # Records overwritten before they were saved
+        self.lastTime = 0               # Sample time of the latest record
+        self.rightCommand = 0
+        self.leftCommand = 0
+        self.slack = LOG_SLACK          # Longest chunk write so far, in microseconds
+
+    # Start a new log file; without an SD card the ring just wraps
+    def begin(self, filename=LOG_FILE):
+        self.filename = filename
+        self.head = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.lastTime = 0
+        self.saving = brain.sdcard.is_inserted()
+        if self.saving:
+            brain.sdcard.savefile(filename, bytearray(struct.pack(LOG_HEADER, b"VXTL", 1, LOG_RECORD)))
+
+    # Latest drive velocities in percent, logged with the next record
+    def command(self, right, left):
+        self.rightCommand = right
+        self.leftCommand = left
+
+    # Log a sensor snapshot, at most one per half control period
+    def record(self, snapshot):
+        if snapshot.time - self.lastTime < LOOP_PERIOD * 500:
+            return
+        self.lastTime = snapshot.time
+        if self.saving and self.head - self.flushed >= self.capacity:
+            self.flushed += 1   # The oldest unsaved record is overwritten
+            self.dropped += 1
+        struct.pack_into(LOG_FORMAT, self.buffer, (self.head % self.capacity) * LOG_RECORD,
+                         snapshot.time & 0xFFFFFFFF,
+                         snapshot.right + snapshot.rightZero, snapshot.left + snapshot.leftZero,
+                         int(self.rightCommand * 100), int(self.leftCommand * 100),
+                         snapshot.rotation, snapshot.lift)
+        self.head += 1
+
+    # Save up to count pending records
+    @profiled
+    def flush(self, count=LOG_RECORDS):
+        while self.saving and count > 0 and self.flushed < self.head:
+            start = self.flushed % self.capacity
+            records = min(count, self.head - self.flushed, self.capacity - start)
+            brain.sdcard.appendfile(self.filename, bytearray(
+                self.view[start * LOG_RECORD:(start + records) * LOG_RECORD]))
+            self.flushed += records
+            count -= records
+
+    # Save a chunk if one is ready and the tick has time for it, going by the
+    # slowest chunk write seen so far
+    def service(self, now, deadline):
+        if self.head - self.flushed >= LOG_CHUNK and deadline - now >= self.slack:
+            self.flush(LOG_CHUNK)
+            self.slack = max(self.slack, brain.timer.system_high_res() - now)
+
+telemetryLog = TelemetryLog()
+
+# Chassis geometry, used until a calibration is loaded
+WHEEL_DIAMETER = 4      # Inches
+INCHES_PER_DEGREE = math.pi * WHEEL_DIAMETER / 360
+TRACK_WIDTH = 11        # Inches between the wheel centres, measured on the robot
+
+# Traction limit: the wheels slip once they push the robot harder than
+# friction allows, friction coefficient times g. WHEEL_FRICTION is an
+# estimate for omni wheels on field tiles, not a measurement, so the profiles
+# keep TRACTION_MARGIN of the limit and the rest in reserve.
+GRAVITY = 386.1         # Inches per second squared
+WHEEL_FRICTION = 0.7
+TRACTION_LIMIT = WHEEL_FRICTION * GRAVITY   # Inches per second squared at the wheels
+TRACTION_MARGIN = 0.8
+JERK_TIME = 0.1         # Seconds to build up to full acceleration
+
+# Motion profile limits, in encoder degrees per second (squared, cubed)
+PERCENT_DPS = 12        # Encoder degrees per second at 1% velocity (200 rpm motors)
+DRIVE_ACCEL = TRACTION_MARGIN * TRACTION_LIMIT / INCHES_PER_DEGREE    # About 6200
+DRIVE_JERK = DRIVE_ACCEL / JERK_TIME
+PROFILE_KP = 5          # Extra degrees per second for each degree behind the profile
+MIN_VELOCITY = 5        # Percent, so the end of a move never stalls
+
+# Motion profile: velocity and position setpoints for a whole move, one per
+# control tick, worked out before the move starts. The velocity is a
+# trapezoid (a triangle for short moves) that is smoothed into an S-curve
+# when a jerk limit is given.
+class MotionProfile:
+    def __init__(self, distance, maxVelocity, maxAccel, jerk=0, period=LOOP_PERIOD):
+        self.period = period / 1000     # Seconds per setpoint
+        self.distance = abs(distance)
+        self.maxVelocity = maxVelocity
+        self.velocity = [0]
+        self.position = [0]
+        if self.distance == 0:
+            return
+
+        # Trapezoid: accelerate, cruise, decelerate
+        peak = min(maxVelocity, math.sqrt(self.distance * maxAccel))
+        accelTime = peak / maxAccel
+        total = 2 * accelTime + (self.distance - peak * accelTime) / peak
+        steps = int(math.ceil(total / self.period))
+        velocity = []
+        for k in range(1, steps + 1):
+            t = k * self.period
+            velocity.append(peak * max(0, min(1, t / accelTime, (total - t) / accelTime)))
+
+        # Averaging over accel / jerk seconds turns the corners into S-curves
+        window = int(round(maxAccel / jerk / self.period)) if jerk else 1
+        if window > 1:
+            smooth = []
+            runningSum = 0
+            for k in range(len(velocity) + window - 1):
+                if k < len(velocity):
+                    runningSum += velocity[k]
+                if k >= window:
+                    runningSum -= velocity[k - window]
+                smooth.append(runningSum / window)
+            velocity = smooth
+
+        # Integrate to positions and scale away the rounding error
+        position = []
+        travelled = 0
+        for v in velocity:
+            travelled += v * self.period
+            position.append(travelled)
+        if travelled == 0:      # Shorter than a tick: get there in one step
+            velocity = [self.distance / self.period]
+            position = [self.distance]
+            travelled = self.distance
+        scale = self.distance / travelled
+        self.velocity = [v * scale for v in velocity]
+        self.position = [p * scale for p in position]
+
+    # Seconds the profile takes
+    def duration(self):
+        return len(self.velocity) * self.period
+
+    # Position and velocity to reach by the end of the current tick
+    def sample(self, elapsed):
+        k = int(elapsed / self.period)
+        if k >= len(self.velocity):
+            return self.distance, 0
+        return self.position[k], self.velocity[k]
+
+    # Setpoint acceleration over the current tick, per second squared
+    def acceleration(self, elapsed):
+        k = int(elapsed / self.period)
+        if k >= len(self.velocity):
+            return 0
+        previous = self.velocity[k - 1] if k else 0
+        return (self.velocity[k] - previous) / self.period
+
+    # Velocity in percent to command now: the profile's setpoint plus a
+    # correction for being behind or ahead of it
+    def command(self, elapsed, travelled):
+        position, velocity = self.sample(elapsed)
+        percent = (velocity + PROFILE_KP * (position - travelled)) / PERCENT_DPS
+        return max(MIN_VELOCITY, min(self.maxVelocity / PERCENT_DPS, percent))
+
+# PID controller for drive sync, heading hold and lift position. update()
+# takes the snapshot timestamp, so every controller in a tick shares one
+# clock. The derivative acts on the measurement, so a jump in the target
+# doesn't kick the output, and it is low-pass filtered. The integral is
+# clamped and stops growing while the output is saturated.
+class PID:
+    def __init__(self, kP, kI=0, kD=0, outputLimit=100, integralLimit=None, smoothing=0.5):
+        self.kP = kP
+        self.kI = kI
+        self.kD = kD
+        self.outputLimit = outputLimit
+        if integralLimit is None:
+            integralLimit = outputLimit / kI if kI else 0
+        self.integralLimit = integralLimit
+        self.smoothing = smoothing      # 0 = raw derivative, closer to 1 = smoother
+        self.reset()
+
+    def reset(self):
+        self.error = 0
+        self.integral = 0
+        self.derivative = 0
+        self.prevActual = 0
+        self.prevTime = None
+
+    # Output for this tick; time is in microseconds, feedforward is added as-is
+    def update(self, target, actual, time, feedforward=0):
+        self.error = target - actual
+        deltaTime = 0
+        if self.prevTime is not None:
+            deltaTime = (time - self.prevTime) / 1000000
+        self.prevTime = time
+
+        integral = self.integral
+        if deltaTime > 0:
+            rate = -(actual - self.prevActual) / deltaTime
+            self.derivative = self.smoothing * self.derivative + (1 - self.smoothing) * rate
+            integral += self.error * deltaTime
+            integral = max(-self.integralLimit, min(self.integralLimit, integral))
+        self.prevActual = actual
+
+        output = feedforward + self.kP * self.error + self.kI * integral + self.kD * self.derivative
+
+        # Anti-windup: keep the old integral if it would push a saturated output further
+        if abs(output) < self.outputLimit or output * self.error < 0:
+            self.integral = integral
+        return max(-self.outputLimit, min(self.outputLimit, output))
+
+# Kinematic calibration: the effective wheel diameter of each side and the
+# effective track width, measured on this robot by the Calibration program
+# and saved to the SD card. Every assignment loads them at startup, and the
+# defaults above stand in when there is no file.
+CALIBRATION_FILE = "calibration.txt"
+CALIBRATION_KEYS = ("rightDiameter", "leftDiameter", "trackWidth")
+# Inches; a value outside these is a bad measurement, not a different robot
+CALIBRATION_LIMITS = {"rightDiameter": (3, 5), "leftDiameter": (3, 5), "trackWidth": (8, 16)}
+
+# Names of the calibration values outside CALIBRATION_LIMITS (NaN is outside)
+def implausible(values):
+    return [key for key in CALIBRATION_KEYS if key in values
+            and not CALIBRATION_LIMITS[key][0] <= values[key] <= CALIBRATION_LIMITS[key][1]]
+
+class Calibration:
+    def __init__(self):
+        self.rightDiameter = WHEEL_DIAMETER     # Inches
+        self.leftDiameter = WHEEL_DIAMETER
+        self.trackWidth = TRACK_WIDTH
+        self.loaded = False
+
+    # Inches a wheel travels per encoder degree: one side, or their average
+    def inchesPerDegree(self, side=None):
+        if side == "right":
+            return math.pi * self.rightDiameter / 360
+        if side == "left":
+            return math.pi * self.leftDiameter / 360
+        return math.pi * (self.rightDiameter + self.leftDiameter) / 720
+
+    # Read the calibration file if there is one; returns True if it was
+    def load(self, filename=CALIBRATION_FILE):
+        if not brain.sdcard.is_inserted() or not brain.sdcard.exists(filename):
+            print("No calibration on the SD card: using the default geometry")
+            return False
+        values = {}
+        for line in bytes(brain.sdcard.loadfile(filename)).decode().split("\n"):
+            words = line.split()
+            if len(words) == 2 and words[0] in CALIBRATION_KEYS:
+                try:
+                    values[words[0]] = float(words[1])
+                except ValueError:
+                    pass
+        bad = implausible(values)
+        if bad:
+            print("Implausible %s in %s: using the default geometry" % (", ".join(bad), filename))
+            return False
+        for key in values:
+            setattr(self, key, values[key])
+        self.loaded = True
+        print(self.describe())
+        return True
+
+    # Write the calibration file; returns False and writes nothing if a value is implausible
+    def save(self, filename=CALIBRATION_FILE):
+        bad = implausible(dict((key, getattr(self, key)) for key in CALIBRATION_KEYS))
+        if bad:
+            print("Implausible %s: calibration not saved" % ", ".join(bad))
+            return False
+        text = "".join("%s %.4f\n" % (key, getattr(self, key)) for key in CALIBRATION_KEYS)
+        brain.sdcard.savefile(filename, bytearray(text.encode()))
+        return True
+
+    def describe(self):
+        return "Calibration: wheels %.3f in right, %.3f in left, track width %.2f in" % (
+            self.rightDiameter, self.leftDiameter, self.trackWidth)
+
+calibration = Calibration()
+
+# Odometry rate: 100 Hz
+ODOMETRY_PERIOD = 10
+
+# Odometry: a background thread integrates the drive encoders along the
+# inertial heading, so the pose carries across moves instead of starting
+# over at each one. Field frame: x along the robot's starting direction,
+# y to its left, heading in clockwise degrees like the inertial sensor.
+class Odometry:
+    def __init__(self, period=ODOMETRY_PERIOD):
+        self.period = period * 1000     # Microseconds between updates
+        self.x = 0
+        self.y = 0
+        self.heading = 0
+        self.velocity = 0               # Inches per second
+        self.turnRate = 0               # Degrees per second, clockwise
+        self.headingOffset = 0
+        self.prevTime = None
+        self.prevRight = 0
+        self.prevLeft = 0
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = Thread(self.run)
+
+    def run(self):
+        nextUpdate = brain.timer.system_high_res()
+        while True:
+            self.update()
+            nextUpdate += self.period
+            delay = nextUpdate - brain.timer.system_high_res()
+            if delay > 0:
+                wait(delay / 1000, MSEC)
+            else:
+                nextUpdate -= delay     # Overran: restart the schedule from now
+
+    @profiled
+    def update(self):
+        time = brain.timer.system_high_res()
+        right = rightMotor.position(DEGREES)
+        left = leftMotor.position(DEGREES)
+        heading = inertial_1.rotation(DEGREES) + self.headingOffset
+        if self.prevTime is None:
+            self.prevTime = time
+            self.prevRight = right
+            self.prevLeft = left
+            self.heading = heading
+
+        # Arc travelled since the last update, along the average heading
+        distance = ((right - self.prevRight) * calibration.inchesPerDegree("right")
+                    + (left - self.prevLeft) * calibration.inchesPerDegree("left")) / 2
+        theta = -math.radians((heading + self.heading) / 2)
+        self.x += distance * math.cos(theta)
+        self.y += distance * math.sin(theta)
+
+        deltaTime = (time - self.prevTime) / 1000000
+        if deltaTime > 0:
+            self.velocity = distance / deltaTime
+            self.turnRate = (heading - self.heading) / deltaTime
+        self.heading = heading
+        self.prevTime = time
+        self.prevRight = right
+        self.prevLeft = left
+
+    # Put the robot at a known field position
+    def setPose(self, x, y, heading):
+        self.update()
+        self.x = x
+        self.y = y
+        self.headingOffset += heading - self.heading
+        self.heading = heading
+
+odometry = Odometry()
+
+# Concurrent actions: a move started as an Action runs on its own thread, so
+# independent subsystems (the lift and the drivetrain) can move at the same
+# time. join() waits for every action; race() waits for the first one and
+# cancels the rest. Cancelling stops the thread and then calls the action's
+# stop function, so nothing is left spinning.
+class Action:
+    def __init__(self, function, args=(), stop=None):
+        self.function = function
+        self.args = args
+        self.stop = stop
+        self.done = False
+        self.start = brain.timer.system_high_res()
+        self.duration = 0               # Seconds, once done
+        self.thread = Thread(self.run)
+
+    # Finish even if the function raises, or join() would wait forever
+    def run(self):
+        try:
+            self.function(*self.args)
+        finally:
+            self.finish()
+
+    def finish(self):
+        if self.done:
+            return
+        self.done = True
+        self.duration = (brain.timer.system_high_res() - self.start) / 1000000
+
+    def cancel(self):
+        if self.done:
+            return
+        self.thread.stop()
+        if self.stop is not None:
+            self.stop()
+        self.finish()
+
+# Wait for every action to finish
+def join(actions):
+    while not all(action.done for action in actions):
+        wait(LOOP_PERIOD, MSEC)
+
+# Wait for the first action to finish, cancel the others and return the winner
+def race(actions):
+    while True:
+        for action in actions:
+            if action.done:
+                for other in actions:
+                    other.cancel()
+                return action
+        wait(LOOP_PERIOD, MSEC)
+
+# Bump switch function: will hold program until switch is pressed
+@profiled
+def bump():
+    batteryCompensation.report()        # A run just finished
+    if PROFILE:
+        profiler.report()
+    while(not bumpSwitch.pressing()):
+        telemetryLog.flush(LOG_CHUNK)   # Idle: save what is left of the log
+        wait(10, MSEC)
+        pass
+
+# Smallest velocity change worth sending: one rpm on a 200 rpm motor
+COMMAND_RESOLUTION = 0.5    # Percent
+VOLTAGE_RESOLUTION = 0.05   # Volts, for voltage-mode spins
+
+# Motor command cache: remembers the last command sent to each motor and only
+# sends a new one when it changes, so the smart ports carry sensor reads
+# instead of repeats. Every motor command has to go through here, or the
+# cache would skip a command the motor never got.
+class MotorCommands:
+    def __init__(self):
+        self.last = {}          # motor -> (value, units), or None when stopped
+        self.sent = 0
+        self.suppressed = 0
+
+    # Spin at a velocity in percent, or at a voltage with units = VOLT
+    def spin(self, motor, velocity, units=PERCENT):
+        resolution = VOLTAGE_RESOLUTION if units == VOLT else COMMAND_RESOLUTION
+        command = (round(velocity / resolution) * resolution, units)
+        if motor in self.last and self.last[motor] == command:
+            self.suppressed += 1
+            return
+        if command[0] >= 0:
+            motor.spin(FORWARD, command[0], units)
+        else:
+            motor.spin(REVERSE, -command[0], units)
+        self.last[motor] = command
+        self.sent += 1
+
+    def stop(self, motor):
+        if motor in self.last and self.last[motor] is None:
+            self.suppressed += 1
+            return
+        motor.stop()
+        self.last[motor] = None
+        self.sent += 1
+
+motorCommands = MotorCommands()
+
+# Drivetrain feedforward: the volts each drive motor needs for a speed and
+# an acceleration, volts = kS + kV * velocity + kA * acceleration in encoder
+# degrees per second, as (right, left) pairs fitted by sim/characterize.py
+# from a DriveCharacterization log. While they are set the drive motors run
+# in voltage mode, with DRIVE_VELOCITY_KP volts per degree per second of speed
+# error on top; while DRIVE_KV is None the motors use their built-in
+# velocity control. They stay None until they have been fitted from a
+# characterize.bin recorded on the robot: values fitted from a simulated run
+# only read back the simulator's motor model.
+DRIVE_KS = None     # Volts to get moving, e.g. (0.6, 0.6)
+DRIVE_KV = None     # Volts per degree per second
+DRIVE_KA = None     # Volts per degree per second squared
+DRIVE_VELOCITY_KP = 0.04        # Volts per degree per second behind
+MAX_VOLTS = 12
+
+# Volts for one side (0 right, 1 left) from a velocity in percent, an
+# acceleration in percent per second and the measured speed in degrees per second
+def driveVolts(side, velocity, accel, measured):
+    velocity *= PERCENT_DPS
+    volts = DRIVE_KV[side] * velocity + DRIVE_KA[side] * accel * PERCENT_DPS
+    if velocity:
+        volts += DRIVE_KS[side] if velocity > 0 else -DRIVE_KS[side]
+    volts += DRIVE_VELOCITY_KP * (velocity - measured)
+    return max(-MAX_VOLTS, min(MAX_VOLTS, volts))
+
+# Battery compensation: a voltage-mode command is a fraction of 12 V applied
+# to whatever the battery gives, so the same feedforward volts drive faster
+# on a fresh battery than on one that has done a few runs. The battery is read
+# every BATTERY_PERIOD and drive volts are scaled by BATTERY_NOMINAL over
+# its (smoothed) voltage, so they mean the same speed all session. Velocity
+# mode needs none of this: the motors' own loops hold the speed, which is why
+# the lift and the DRIVE_KV = None drive are left alone. A low battery only
+# costs them top speed and torque, which scaling a velocity can't give back.
+# The battery is still read and reported every run in either mode, with a
+# scale of 1 in velocity mode, so runs can be compared against their charge.
+# Not yet checked on the robot: that voltage-mode commands scale with the
+# battery is an assumption, and the simulator models it the same way, so a
+# simulated run can't confirm it. It only acts once DRIVE_KV is fitted.
+BATTERY_NOMINAL = 12        # Volts a voltage-mode command is a fraction of
+BATTERY_PERIOD = 250        # Milliseconds between battery reads
+BATTERY_SMOOTHING = 0.3     # Weight of each new read; the voltage sags under load
+BATTERY_SCALE_LIMITS = (0.8, 1.25)  # Against a bad read
+
+class BatteryCompensation:
+    def __init__(self):
+        self.volts = None       # Smoothed battery voltage
+        self.scale = 1.0        # Factor applied to drive volts
+        self.compensating = False   # True while the drive runs in voltage mode
+        self.nextRead = 0       # Snapshot time of the next read, in microseconds
+        self.reset()
+
+    # Forget the statistics of the last run
+    def reset(self):
+        self.reads = 0
+        self.minScale = None
+        self.maxScale = None
+        self.totalScale = 0
+        self.lowVolts = None
+
+    # Read the battery if it is due; the scale stays 1 unless compensating
+    def update(self, now, compensate):
+        self.compensating = compensate
+        if now < self.nextRead:
+            return
+        self.nextRead = now + BATTERY_PERIOD * 1000
+        volts = brain.battery.voltage(VOLT)
+        if volts <= 0:
+            return
+        if self.volts is None:
+            self.volts = volts
+        else:
+            self.volts += BATTERY_SMOOTHING * (volts - self.volts)
+        low, high = BATTERY_SCALE_LIMITS
+        self.scale = max(low, min(high, BATTERY_NOMINAL / self.volts)) if compensate else 1.0
+
+        self.reads += 1
+        self.totalScale += self.scale
+        self.minScale = self.scale if self.minScale is None else min(self.minScale, self.scale)
+        self.maxScale = self.scale if self.maxScale is None else max(self.maxScale, self.scale)
+        self.lowVolts = self.volts if self.lowVolts is None else min(self.lowVolts, self.volts)
+
+    # Volts to command for volts wanted at nominal battery
+    def apply(self, volts):
+        return max(-MAX_VOLTS, min(MAX_VOLTS, volts * self.scale))
+
+    # Print the battery and the compensation applied since the last report
+    def report(self):
+        if self.reads:
+            mode = "voltage mode" if self.compensating else "velocity mode, not compensated"
+            print("Battery: %.2f V at its lowest, drive scaled x%.3f on average (x%.3f to x%.3f, %d reads, %s)" % (
+                self.lowVolts, self.totalScale / self.reads, self.minScale, self.maxScale, self.reads, mode))
+        self.reset()
+
+batteryCompensation = BatteryCompensation()
+
+# Spin motors; accelerations in percent per second feed forward with the velocities
+def spinMotors(vel1, vel2, accel1=0, accel2=0):
+    telemetryLog.command(vel1, vel2)
+    batteryCompensation.update(sensors.time, DRIVE_KV is not None)
+    if DRIVE_KV is None:
+        motorCommands.spin(rightMotor, vel1)
+        motorCommands.spin(leftMotor, vel2)
+        return
+    motorCommands.spin(rightMotor, batteryCompensation.apply(
+        driveVolts(0, vel1, accel1, sensors.rightVelocity)), VOLT)
+    motorCommands.spin(leftMotor, batteryCompensation.apply(
+        driveVolts(1, vel2, accel2, sensors.leftVelocity)), VOLT)
+
+# Stop motors
+def stopMotors():
+    telemetryLog.command(0, 0)
+    motorCommands.stop(rightMotor)
+    motorCommands.stop(leftMotor)
+
+def stopLift():
+    motorCommands.stop(liftMotor)
+
+# Print encoder values to screen; the fields are added on first use
+def encoderValues():
+    if "right" not in telemetry.fields:
+        telemetry.field("right", 1, 1, "Right Encoder: ")
+        telemetry.field("left", 1, 25, "Left Encoder: ")
+    telemetry.set("right", sensors.right)   # Right encoder
+    telemetry.set("left", sensors.left)     # Left encoder
+
+# Show a lift angle below the encoders; the screen is only written through
+# telemetry, which runs from whichever loop is ticking
+def liftValues(name, angle):
+    if "liftStart" not in telemetry.fields:
+        telemetry.field("liftStart", 2, 1, "Initial Rotation: ")
+        telemetry.field("liftFinal", 3, 1, "Final Rotation: ")
+    telemetry.set(name, angle)
+
+# Inertial heading control. Angles are inertial rotation degrees, which
+# count up clockwise; the route's intended heading is kept in targetRotation
+# so turn errors don't add up from move to move.
+TURN_DPS = 4.4          # Robot degrees per second at 1% wheel velocity
+# Robot degrees per second squared that put the wheels, half the track
+# width out, at the same traction margin: about 2250
+GYRO_TURN_ACCEL = math.degrees(TRACTION_MARGIN * TRACTION_LIMIT / (TRACK_WIDTH / 2))
+GYRO_TURN_JERK = GYRO_TURN_ACCEL / JERK_TIME
+HEADING_KP = 2          # Percent per degree of heading error
+HEADING_KI = 2
+HEADING_KD = 0.1
+TURN_TOLERANCE = 1      # Degrees of heading error that counts as there
+TURN_SETTLE_RATE = 10   # Degrees per second that counts as stopped
+TURN_TIMEOUT = 1        # Seconds allowed after the profile ends
+
+targetRotation = 0
+
+# Calibrate the inertial sensor; the robot has to stay still for about 2 seconds
+@profiled
+def calibrateInertial():
+    inertial_1.calibrate()
+    while inertial_1.is_calibrating():
+        wait(50, MSEC)
+    resetPose()
+
+# Take the robot's current pose and lift arm angle as the start of the route
+def resetPose():
+    global targetRotation, liftTarget
+    inertial_1.set_rotation(0, DEGREES)
+    targetRotation = 0
+    liftTarget = liftArmRotation.position(DEGREES)
+    odometry.setPose(0, 0, 0)
+
+# Drive straight while holding the route heading with the inertial sensor
+@profiled
+def gyroDriveStraight(distance, normalVelocity, reverse=False):
+    direction = 1
+    if reverse:
+        direction = -1
+
+    # Calculate the count value required
+    count = distance / calibration.inchesPerDegree()
+
+    # Reset the encoders
+    sensors.zeroEncoders()
+
+    hold = PID(HEADING_KP, HEADING_KI, HEADING_KD, outputLimit=normalVelocity / 4)
+    profile = MotionProfile(count, normalVelocity * PERCENT_DPS, DRIVE_ACCEL, DRIVE_JERK)
+    loop = ControlLoop()
+
+    # while loop will run until the average encoder value = total count value
+    while (abs(sensors.right) + abs(sensors.left)) / 2 < count:
+        travelled = (abs(sensors.right) + abs(sensors.left)) / 2
+        velocity = profile.command(loop.elapsed(), travelled)
+        accel = direction * profile.acceleration(loop.elapsed()) / PERCENT_DPS
+
+        # Positive correction turns clockwise: speed up the left side
+        correction = hold.update(targetRotation, sensors.rotation, sensors.time)
+        spinMotors(direction * velocity - correction, direction * velocity + correction, accel, accel)
+        encoderValues()     # Shown on the screen in the tick's spare time
+        loop.tick()
+
+    stopMotors()
+    telemetry.draw()
+    loop.report("gyroDriveStraight")
+
+# Point turn on the inertial sensor: left (direction = 1) or right (direction = -1)
+# by angle degrees from the route heading
+def gyroTurn(angle, motorVelocity, direction):
+    turnToHeading(targetRotation - direction * angle, motorVelocity)
+
+# Point turn to a heading in clockwise degrees from the route start
+@profiled
+def turnToHeading(heading, motorVelocity):
+    global targetRotation
+    targetRotation = heading
+
+    loop = ControlLoop()
+    start = sensors.rotation
+    turn = abs(targetRotation - start)
+    profile = MotionProfile(turn, motorVelocity * TURN_DPS, GYRO_TURN_ACCEL, GYRO_TURN_JERK)
+    hold = PID(HEADING_KP, HEADING_KI, HEADING_KD, outputLimit=motorVelocity)
+    sign = 1 if targetRotation < start else -1  # 1 when turning left
+
+    # Follow the profile, then finish on the heading error
+    while loop.elapsed() < profile.duration() + TURN_TIMEOUT:
+        turned = sign * (start - sensors.rotation)
+        position, velocity = profile.sample(loop.elapsed())
+        if (loop.elapsed() >= profile.duration() and abs(turn - turned) < TURN_TOLERANCE
+                and abs(sensors.turnRate) < TURN_SETTLE_RATE):
+            break
+
+        vel = hold.update(position, turned, sensors.time, velocity / TURN_DPS)
+        if abs(turn - turned) >= TURN_TOLERANCE and abs(vel) < MIN_VELOCITY:
+            vel = MIN_VELOCITY if vel > 0 else -MIN_VELOCITY    # Enough to overcome friction
+        accel = profile.acceleration(loop.elapsed()) / TURN_DPS
+        spinMotors(sign * vel, -sign * vel, sign * accel, -sign * accel)
+        loop.tick()
+
+    stopMotors()
+    loop.report("turnToHeading")
+
+# Turn toward a field position (inches from the route start) and drive to it
+def driveToPoint(x, y, normalVelocity, turnVelocity):
+    dx = x - odometry.x
+    dy = y - odometry.y
+    bearing = -math.degrees(math.atan2(dy, dx))     # Clockwise, like the inertial sensor
+    turn = (bearing - targetRotation + 180) % 360 - 180
+    turnToHeading(targetRotation + turn, turnVelocity)
+    gyroDriveStraight(math.sqrt(dx * dx + dy * dy), normalVelocity)
+
+# Pure pursuit path following: the robot steers along the arc through the
+# point PATH_LOOKAHEAD inches further along the path, from its odometry pose,
+# so a multi-leg route becomes one continuous curve. Speeds along the path
+# are planned before the move starts: slow enough on curves to keep the
+# sideways acceleration under PATH_LATERAL_ACCEL, and braking to a stop at
+# the end. Paths are lists of field points in inches from the route start.
+PATH_LOOKAHEAD = 10     # Inches
+PATH_SPACING = 1        # Inches between the planned points
+PATH_LATERAL_ACCEL = 60 # Inches per second squared toward the centre of a curve
+PATH_TOLERANCE = 0.5    # Inches short of the end that counts as there
+PATH_TIMEOUT = 1        # Seconds allowed past the planned time
+
+# Planned path: points every PATH_SPACING inches with the speed to pass each
+# one at, in inches per second
+class Path:
+    def __init__(self, points, maxSpeed, minSpeed):
+        self.x = []
+        self.y = []
+        for (x0, y0), (x1, y1) in zip(points, points[1:]):
+            length = math.sqrt((x1 - x0) ** 2 + (y1 - y0) ** 2)
+            if length == 0:
+                continue        # A repeated point adds nothing
+            steps = max(1, int(math.ceil(length / PATH_SPACING)))
+            for k in range(steps):
+                self.x.append(x0 + (x1 - x0) * k / steps)
+                self.y.append(y0 + (y1 - y0) * k / steps)
+        self.x.append(points[-1][0])
+        self.y.append(points[-1][1])
+        count = len(self.x)
+        self.accel = DRIVE_ACCEL * calibration.inchesPerDegree()   # Inches per second squared
+
+        # Curvature through the points half a lookahead either side, so a
+        # corner is planned as the curve the robot will actually drive
+        span = max(1, int(PATH_LOOKAHEAD / PATH_SPACING / 2))
+        self.speed = []
+        for k in range(count):
+            a, b = max(0, k - span), min(count - 1, k + span)
+            curvature = self.curvature(a, k, b)
+            speed = maxSpeed
+            if curvature > 0:
+                speed = min(speed, math.sqrt(PATH_LATERAL_ACCEL / curvature))
+            self.speed.append(speed)
+
+        # Brake in time for the slow parts and the end
+        self.speed[-1] = minSpeed
+        for k in range(count - 2, -1, -1):
+            step = self.step(k)
+            self.speed[k] = max(minSpeed, min(self.speed[k],
+                                              math.sqrt(self.speed[k + 1] ** 2 + 2 * self.accel * step)))
+
+    # Curvature of the circle through three of the points, in 1 / inches
+    def curvature(self, a, k, b):
+        ax, ay = self.x[k] - self.x[a], self.y[k] - self.y[a]
+        bx, by = self.x[b] - self.x[k], self.y[b] - self.y[k]
+        cx, cy = self.x[b] - self.x[a], self.y[b] - self.y[a]
+        product = math.sqrt((ax * ax + ay * ay) * (bx * bx + by * by) * (cx * cx + cy * cy))
+        if product == 0:
+            return 0
+        return 2 * abs(ax * by - ay * bx) / product
+
+    # Inches from point k to the next one. The brain's math module has no
+    # hypot, so distances are square roots throughout.
+    def step(self, k):
+        dx, dy = self.x[k + 1] - self.x[k], self.y[k + 1] - self.y[k]
+        return math.sqrt(dx * dx + dy * dy)
+
+    # Seconds the path takes at the planned speeds
+    def duration(self):
+        total = 0
+        for k in range(len(self.x) - 1):
+            total += 2 * self.step(k) / (self.speed[k] + self.speed[k + 1])
+        return total
+
+    # Index of the point nearest (x, y), searching on from the last one
+    def closest(self, x, y, start):
+        best = start
+        bestDistance = None
+        for k in range(start, min(len(self.x), start + 2 * PATH_LOOKAHEAD // PATH_SPACING + 1)):
+            distance = (self.x[k] - x) ** 2 + (self.y[k] - y) ** 2
+            if bestDistance is None or distance < bestDistance:
+                best = k
+                bestDistance = distance
+        return best
+
+    # First point at least PATH_LOOKAHEAD from (x, y) past the nearest one
+    def lookahead(self, x, y, start):
+        for k in range(start, len(self.x)):
+            if (self.x[k] - x) ** 2 + (self.y[k] - y) ** 2 >= PATH_LOOKAHEAD ** 2:
+                return self.x[k], self.y[k]
+        return self.x[-1], self.y[-1]
+
+    # Inches from (x, y) to the end, measured along the last segment, or
+    # straight to it when the path is a single point
+    def remaining(self, x, y):
+        if len(self.x) < 2:
+            return math.sqrt((self.x[-1] - x) ** 2 + (self.y[-1] - y) ** 2)
+        dx, dy = self.x[-1] - self.x[-2], self.y[-1] - self.y[-2]
+        length = math.sqrt(dx * dx + dy * dy)
+        return ((self.x[-1] - x) * dx + (self.y[-1] - y) * dy) / length
+
+# Drive through field points (x, y) in one continuous motion, backwards when
+# reverse is set. Afterwards the route heading is the last leg's direction.
+@profiled
+def followPath(points, normalVelocity, reverse=False):
+    global targetRotation
+    percent = PERCENT_DPS * calibration.inchesPerDegree()   # Inches per second at 1%
+    path = Path([(odometry.x, odometry.y)] + list(points), normalVelocity * percent,
+                MIN_VELOCITY * percent)
+    timeout = path.duration() + PATH_TIMEOUT
+    loop = ControlLoop()
+    nearest = 0
+    speed = 0
+
+    while loop.elapsed() < timeout:
+        x = odometry.x
+        y = odometry.y
+        nearest = path.closest(x, y, nearest)
+        if nearest >= len(path.x) - 1 - PATH_LOOKAHEAD / PATH_SPACING and path.remaining(x, y) < PATH_TOLERANCE:
+            break
+
+        # Goal point in the robot's frame; driving backwards flips the robot round
+        theta = -math.radians(odometry.heading) + (math.pi if reverse else 0)
+        goalX, goalY = path.lookahead(x, y, nearest)
+        dx = goalX - x
+        dy = goalY - y
+        offset = -dx * math.sin(theta) + dy * math.cos(theta)   # Inches to the left
+        curvature = 2 * offset / max(1, dx * dx + dy * dy)  # 1 / inches, positive turns left
+
+        previous = speed
+        speed = min(path.speed[nearest], speed + path.accel * loop.period / 1000000)
+        speed = max(speed, MIN_VELOCITY * percent)
+        accel = (speed - previous) / (loop.period / 1000000)
+        right = (1 + curvature * calibration.trackWidth / 2) / percent  # Wheel percent per inch per second
+        left = (1 - curvature * calibration.trackWidth / 2) / percent
+        if reverse:
+            spinMotors(-left * speed, -right * speed, -left * accel, -right * accel)
+        else:
+            spinMotors(right * speed, left * speed, right * accel, left * accel)
+        loop.tick()
+
+    stopMotors()
+    dx = path.x[-1] - path.x[-2]
+    dy = path.y[-1] - path.y[-2]
+    bearing = -math.degrees(math.atan2(dy, dx)) + (180 if reverse else 0)
+    targetRotation += (bearing - targetRotation + 180) % 360 - 180
+    loop.report("followPath")
+
+# Swing and arc turns: the robot turns about a point radius inches to the
+# side of its centre instead of about the centre itself, so it keeps moving
+# through a corner. A swing turn holds the inside wheel still (radius
+# half the track width). The encoder target is the arc length of the robot's
+# centre, from the radius and the wheel diameter; the wheel speeds come from
+# the track width, and the inertial sensor keeps the heading where the
+# distance driven says it should be.
+
+# Turn angle degrees left (direction = 1) or right (direction = -1) along an
+# arc of the given radius, backwards when reverse is set
+@profiled
+def arcTurn(angle, radius, motorVelocity, direction, reverse=False):
+    global targetRotation
+    targetRotation -= direction * angle
+    outside = (radius + calibration.trackWidth / 2) / radius   # Wheel speeds over the centre's
+    inside = (radius - calibration.trackWidth / 2) / radius
+    count = math.radians(angle) * radius / calibration.inchesPerDegree()   # Centre's encoder degrees
+
+    # Reset the encoders
+    sensors.zeroEncoders()
+
+    hold = PID(HEADING_KP, HEADING_KI, HEADING_KD, outputLimit=motorVelocity / 4)
+    # Profile the centre so the outside wheel keeps to the drive limits
+    profile = MotionProfile(count, motorVelocity / outside * PERCENT_DPS,
+                            DRIVE_ACCEL / outside, DRIVE_JERK / outside)
+    loop = ControlLoop()
+    start = sensors.rotation
+    rightOutside = (direction == 1) != reverse  # Backing round a left turn swings the left side
+    sign = -1 if reverse else 1
+
+    # while loop will run until the average encoder value = total count value
+    while (abs(sensors.right) + abs(sensors.left)) / 2 < count:
+        travelled = (abs(sensors.right) + abs(sensors.left)) / 2
+        velocity = sign * profile.command(loop.elapsed(), travelled)
+        accel = sign * profile.acceleration(loop.elapsed()) / PERCENT_DPS
+
+        # Heading the robot should have reached this far round the arc
+        expected = start - direction * math.degrees(travelled / count * math.radians(angle))
+        correction = hold.update(expected, sensors.rotation, sensors.time)
+        if rightOutside:
+            spinMotors(velocity * outside - correction, velocity * inside + correction,
+                       accel * outside, accel * inside)
+        else:
+            spinMotors(velocity * inside - correction, velocity * outside + correction,
+                       accel * inside, accel * outside)
+        loop.tick()
+
+    stopMotors()
+    loop.report("arcTurn")
+
+# Turn about the inside wheel
+def swingTurn(angle, motorVelocity, direction, reverse=False):
+    arcTurn(angle, calibration.trackWidth / 2, motorVelocity, direction, reverse)
+
+# Settle detection: a move has finished once the drive motors, the inertial
+# gyro and the lift arm have all stayed below these speeds for SETTLE_HOLD
+SETTLE_DRIVE_RPM = 2    # Drive motor rpm
+SETTLE_TURN_RATE = 2    # Inertial degrees per second
+SETTLE_LIFT_RATE = 5    # Lift arm degrees per second
+SETTLE_HOLD = 0.05      # Seconds at rest that count as settled
+SETTLE_TIMEOUT = 1      # Seconds before giving up and moving on
+SETTLE_TIME = 0.5       # The fixed wait this replaces, for the time-saved log
+
+settleSaved = 0         # Seconds saved against SETTLE_TIME since the last report
+
+# Wait until the drivetrain and / or the lift are at rest; returns the
+# seconds it took
+@profiled
+def settle(timeout=SETTLE_TIMEOUT, drive=True, lift=True):
+    global settleSaved
+    snapshot = sensors if drive else liftSensors
+    loop = ControlLoop(snapshot=snapshot, rates=True)
+    restStart = None
+    while loop.elapsed() < timeout:
+        moving = drive and (abs(snapshot.rightVelocity) > SETTLE_DRIVE_RPM * 6     # 6 dps per rpm
+                            or abs(snapshot.leftVelocity) > SETTLE_DRIVE_RPM * 6
+                            or abs(snapshot.gyroRate) > SETTLE_TURN_RATE)
+        moving = moving or (lift and abs(snapshot.liftVelocity) > SETTLE_LIFT_RATE)
+        if moving:
+            restStart = None
+        elif restStart is None:
+            restStart = loop.elapsed()
+        elif loop.elapsed() - restStart >= SETTLE_HOLD:
+            break
+        loop.tick()
+
+    settleSaved += SETTLE_TIME - loop.elapsed()
+    return loop.elapsed()
+
+# Route steps are (action, amount, policy) tuples. Drives are in inches
+# (negative reverses), turns in degrees (positive turns left), lifts in
+# degrees of arm travel and waits in seconds. "swing" steps are turns in
+# degrees about the inside wheel and "arc" steps (degrees, radius) turns
+# along an arc. "path" and "reverse" steps follow a list of field points
+# forwards or backwards. SETTLE waits after the step
+# until the robot has stopped moving; BLEND goes straight on. A PARALLEL lift
+# starts and the route carries on with the drivetrain while it moves; it is
+# waited for before the next lift step and at the end of the route.
+SETTLE = "settle"
+BLEND = "blend"
+PARALLEL = "parallel"
+
+# Turn planning: a turn between two forward drives can also be driven as a
+# swing turn or an arc joining the two lines, which takes the arc's tangent
+# length off both drives. planTurns() predicts the time of each option from
+# the motion profiles the moves would follow and keeps the fastest one at
+# each corner. A corner may use up to half of either drive. The drive into a
+# swing or arc and the turn itself BLEND, so the robot doesn't wait to settle
+# at either end of the corner; the drive out keeps its own policy.
+ARC_RADII = (12, 18, 24)    # Inches, arcs tried besides the swing turn
+MIN_DRIVE = 0.5             # Inches; shorter drives are left out
+
+# Seconds the moves take by their motion profiles
+def driveTime(distance, velocity):
+    return MotionProfile(distance / calibration.inchesPerDegree(), velocity * PERCENT_DPS,
+                         DRIVE_ACCEL, DRIVE_JERK).duration()
+
+def pointTurnTime(angle, velocity):
+    return MotionProfile(angle, velocity * TURN_DPS, GYRO_TURN_ACCEL, GYRO_TURN_JERK).duration()
+
+def arcTime(angle, radius, velocity):
+    # The outside wheel runs at velocity and the drive limits, so the centre goes slower
+    outside = (radius + calibration.trackWidth / 2) / radius
+    return MotionProfile(math.radians(angle) * radius / calibration.inchesPerDegree(),
+                         velocity / outside * PERCENT_DPS, DRIVE_ACCEL / outside,
+                         DRIVE_JERK / outside).duration()
+
+# Return the route with the fastest turn type at each corner. Arcs and swing
+# turns run at the drive velocity and point turns at turnVelocity, so pass
+# the velocities the route will be run with.
+def planTurns(route, driveVelocity, turnVelocity):
+    route = list(route)
+    for k in range(1, len(route) - 1):
+        before, turn, after = route[k - 1], route[k], route[k + 1]
+        if (turn[0] != "turn" or before[0] != "drive" or after[0] != "drive"
+                or before[1] <= 0 or after[1] <= 0):
+            continue
+        angle = abs(turn[1])
+        if angle >= 180:
+            continue
+        first = before[1]
+        second = after[1]
+        budget = min(first, second / 2)     # The next corner may want the other half
+
+        bestTime = driveTime(first, driveVelocity) + pointTurnTime(angle, turnVelocity)
+        bestTime += driveTime(second, driveVelocity)
+        pointTime = bestTime
+        best = None
+        for radius in (calibration.trackWidth / 2,) + ARC_RADII:
+            tangent = radius * math.tan(math.radians(angle) / 2)
+            if tangent > budget:
+                continue
+            time = driveTime(first - tangent, driveVelocity) + arcTime(angle, radius, driveVelocity)
+            time += driveTime(second - tangent, driveVelocity)
+            if time < bestTime:
+                bestTime = time
+                best = (radius, tangent)
+        if best is None:
+            continue
+
+        radius, tangent = best
+        route[k - 1] = (before[0], first - tangent, BLEND)
+        if radius == calibration.trackWidth / 2:
+            route[k] = ("swing", turn[1], BLEND)
+        else:
+            route[k] = ("arc", (turn[1], radius), BLEND)
+        route[k + 1] = (after[0], second - tangent, after[2])
+        print("Corner %d: %s r%.1f saves %.2f s" % (k, route[k][0], radius, pointTime - bestTime))
+    return [step for step in route if step[0] != "drive" or abs(step[1]) >= MIN_DRIVE]
+
+# Run a route and report which steps the mission time went to
+@profiled
+def runRoute(route, driveVelocity, turnVelocity, liftVelocity=0):
+    global settleSaved
+    settleSaved = 0
+    start = brain.timer.system_high_res()
+    times = []              # (step, move seconds, settle seconds)
+    lifting = None          # (step, Action) of a lift moving in parallel
+    for step in route:
+        action, amount, policy = step
+        if lifting is not None and action in ("lift", "wait"):
+            join([lifting[1]])
+            times.append((lifting[0], lifting[1].duration, 0))
+            lifting = None
+
+        stepStart = brain.timer.system_high_res()
+        if policy == PARALLEL:
+            lifting = (step, Action(liftArm, (liftVelocity, amount), stopLift))
+            continue
+        elif action == "drive":
+            gyroDriveStraight(abs(amount), driveVelocity, reverse=amount < 0)
+        elif action == "turn":
+            gyroTurn(abs(amount), turnVelocity, 1 if amount > 0 else -1)
+        elif action == "swing":
+            swingTurn(abs(amount), driveVelocity, 1 if amount > 0 else -1)
+        elif action == "arc":
+            angle, radius = amount
+            arcTurn(abs(angle), radius, driveVelocity, 1 if angle > 0 else -1)
+        elif action in ("path", "reverse"):
+            followPath(amount, driveVelocity, reverse=action == "reverse")
+        elif action == "lift":
+            liftArm(liftVelocity, amount)
+        elif action == "wait":
+            wait(amount, SECONDS)
+        moveEnd = brain.timer.system_high_res()
+
+        if policy == SETTLE:
+            settle(drive=action != "lift", lift=lifting is None)
+        stepEnd = brain.timer.system_high_res()
+        times.append((step, (moveEnd - stepStart) / 1000000, (stepEnd - moveEnd) / 1000000))
+
+    if lifting is not None:
+        join([lifting[1]])
+        times.append((lifting[0], lifting[1].duration, 0))
+    reportRoute(times, (brain.timer.system_high_res() - start) / 1000000)
+    return times
+
+# Print route step times, slowest first
+def reportRoute(times, total):
+    print("Route: %.2f s in %d steps" % (total, len(times)))
+    for step, move, settle in sorted(times, key=lambda t: t[1] + t[2], reverse=True):
+        amount = step[1]
+        if isinstance(amount, tuple):
+            amount = "%.0f r%.0f" % amount
+        elif isinstance(amount, list):
+            amount = "%d pts" % len(amount)
+        else:
+            amount = "%6.1f" % amount
+        print("  %-7s %7s %-8s  move %5.2f s  settle %4.2f s  %3d%%" % (
+            step[0], amount, step[2], move, settle, 100 * (move + settle) / total))
+    print("Settling saved %.2f s against fixed %.1f s waits" % (settleSaved, SETTLE_TIME))
+
+# Lift arm control. Angles are absolute rotation sensor degrees, and the
+# arm's intended angle is kept in liftTarget, so lift moves are made against
+# it instead of resetting the sensor each time and errors don't add up from
+# move to move. The arm follows a motion profile with a position loop on the
+# sensor and is left to the motor's HOLD position loop between moves.
+LIFT_DPS = 2.4          # Arm degrees per second at 1% motor velocity
+LIFT_ACCEL = 2000       # Arm degrees per second squared
+LIFT_JERK = 20000
+LIFT_KP = 3             # Percent per degree of arm error
+LIFT_KI = 1
+LIFT_KD = 0.05
+LIFT_TOLERANCE = 1      # Degrees of arm error that counts as there
+LIFT_SETTLE_RATE = 10   # Arm degrees per second that counts as stopped
+LIFT_TIMEOUT = 0.5      # Seconds allowed after the profile ends
+
+liftTarget = 0
+
+# Move the lift arm angle degrees (positive raises it) from its target
+@profiled
+def liftArm(motorVelocity, angle):
+    global liftTarget
+    liftTarget += angle
+
+    loop = ControlLoop(snapshot=liftSensors)
+    start = liftSensors.lift
+    travel = abs(liftTarget - start)
+    profile = MotionProfile(travel, motorVelocity * LIFT_DPS, LIFT_ACCEL, LIFT_JERK)
+    hold = PID(LIFT_KP, LIFT_KI, LIFT_KD, outputLimit=motorVelocity)
+    sign = 1 if liftTarget > start else -1     # 1 when raising
+
+    liftValues("liftStart", start)
+
+    # Follow the profile, then finish on the arm error
+    while loop.elapsed() < profile.duration() + LIFT_TIMEOUT:
+        moved = sign * (liftSensors.lift - start)
+        position, velocity = profile.sample(loop.elapsed())
+        if (loop.elapsed() >= profile.duration() and abs(travel - moved) < LIFT_TOLERANCE
+                and abs(liftSensors.liftSpeed) < LIFT_SETTLE_RATE):
+            break
+
+        vel = hold.update(position, moved, liftSensors.time, velocity / LIFT_DPS)
+        motorCommands.spin(liftMotor, sign * vel)
+        loop.tick()
+
+    stopLift()      # The motor holds the arm here
+    liftValues("liftFinal", liftSensors.lift)
+    telemetry.draw()
+    loop.report("liftArm")
@@ -0,0 +1,206 @@
+# ---------------------------------------------------------------------------- #
+#                                                                              #
+# 	Module:       bench.py                                                     #
+# 	Created:      10/18/2026                                                   #
+# 	Description:  Benchmark every assignment's mission in the simulator        #
+#                                                                              #
+# ---------------------------------------------------------------------------- #
+
+# Usage:
+#   python sim/bench.py --output bench.json
+#   python sim/bench.py --output new.json --compare bench.json
+#
+# Runs A3 (120 in straight), A4 (point turn), A6 (sentry square), A7 and A8
+# once per seed and records mission time, final pose error, peak heading
+# drift while driving straight and the control-loop ticks each script
+# reports. Results are saved as JSON together with the git commit, and
+# --compare prints the change against an earlier file, flagging any metric
+# that got worse by more than --threshold percent and by more than its
+# TOLERANCES entry. It refuses a file recorded with different seeds, since
+# the seeds alone move the numbers by more than a change usually does.
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import math
+import os
+import re
+import subprocess
+import sys
+
+SIM_DIR = os.path.dirname(os.path.abspath(__file__))
+if SIM_DIR not in sys.path:
+    sys.path.insert(0, SIM_DIR)
+
+from run import poseError, runMission  # noqa: E402
+
+ROOT = os.path.dirname(SIM_DIR)
+ASSIGNMENTS = ["A3_AutomaticStraightening", "A4_PointTurn", "A6_SentrySimulation",
+               "A7_RotationSensor", "A8_TransportChallenge"]
+SEEDS = [0, 1, 2]
+
+STRAIGHT_SPEED = 2.0    # Inches per second; slower than this isn't a drive
+STRAIGHT_SPREAD = 0.2   # Wheel speed difference, as a fraction of the mean, that makes a curve
+TICKS_LINE = re.compile(r"^(\w+): (\d+) ticks, (\d+) overruns", re.MULTILINE)
+
+# Metrics where bigger is worse, compared by --compare
+METRICS = ["missionTime", "distanceError", "headingError", "peakDrift", "ticks", "calls"]
+# Growth in each metric's own units that is still noise, however big in percent
+TOLERANCES = {
+    "missionTime": 0.05,    # Seconds
+    "distanceError": 0.1,   # Inches
+    "headingError": 0.2,    # Degrees
+    "peakDrift": 0.2,       # Degrees
+    "ticks": 5,
+    "calls": 50,
+}
+
+
+class DriftMonitor:
+    """
+    Peak heading change within a straight drive: from when both wheels start
+    moving the same way at about the same speed until they stop doing so.
+    """
+
+    def __init__(self):
+        self.peak = 0.0
+        self.start = None
+
+    def __call__(self, sim):
+        model = sim.chassis
+        right = model.wheelSpeed(model.right)
+        left = model.wheelSpeed(model.left)
+        curving = abs(right - left) > STRAIGHT_SPREAD * abs(right + left) / 2
+        if right * left <= 0 or curving or abs(model.velocity) < STRAIGHT_SPEED:
+            self.start = None
+            return
+        heading = -math.degrees(model.theta)
+        if self.start is None:
+            self.start = heading
+        self.peak = max(self.peak, abs(heading - self.start))
+
+
+def benchmark(name, seed, timeout):
+    path = os.path.join(ROOT, name, "src", "main.py")
+    drift = DriftMonitor()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = runMission(path, seed=seed, timeout=timeout, monitors=[drift])
+
+    ticks = {}
+    overruns = 0
+    for loop, count, missed in TICKS_LINE.findall(output.getvalue()):
+        ticks[loop] = ticks.get(loop, 0) + int(count)
+        overruns += int(missed)
+    error = poseError(result) or (0.0, 0.0)
+    return {
+        "assignment": name,
+        "seed": seed,
+        "error": result["error"],
+        "missionTime": sum(result["missionTimes"]),
+        "distanceError": error[0],
+        "headingError": error[1],
+        "peakDrift": drift.peak,
+        "ticks": sum(ticks.values()),
+        "overruns": overruns,
+        "loopTicks": ticks,
+        "calls": result["calls"],
+        "wallTime": result["wallTime"],
+    }
+
+
+def summarise(runs):
+    # Mean of each metric over the seeds, per assignment
+    summary = {}
+    for name in ASSIGNMENTS:
+        rows = [run for run in runs if run["assignment"] == name]
+        if rows:
+            summary[name] = {metric: sum(row[metric] for row in rows) / len(rows)
+                             for metric in METRICS}
+    return summary
+
+
+def gitCommit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def printSummary(summary):
+    print("%-26s %9s %8s %8s %8s %7s %8s" % (
+        "assignment", "mission", "dist", "heading", "drift", "ticks", "calls"))
+    for name, row in summary.items():
+        print("%-26s %7.2f s %5.2f in %6.2f d %6.2f d %7.0f %8.0f" % (
+            name, row["missionTime"], row["distanceError"], row["headingError"],
+            row["peakDrift"], row["ticks"], row["calls"]))
+
+
+def compare(summary, baseline, threshold):
+    # Print changes against an earlier run; returns the number of regressions
+    regressions = 0
+    print("change against %s" % (baseline.get("commit") or "baseline"))
+    for name, row in summary.items():
+        old = baseline["summary"].get(name)
+        if old is None:
+            continue
+        changes = []
+        for metric in METRICS:
+            before, after = old[metric], row[metric]
+            if before == after:
+                continue
+            percent = 100 * (after - before) / before if before else float("inf")
+            worse = percent > threshold and after - before > TOLERANCES[metric]
+            regressions += worse
+            changes.append("%s %+.1f%%%s" % (metric, percent, " (worse)" if worse else ""))
+        print("  %-26s %s" % (name, ", ".join(changes) or "no change"))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", default="bench.json", help="JSON file to write")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results to compare with")
+    parser.add_argument("--threshold", type=float, default=5.0,
+                        help="percent a metric may grow before it counts as a regression")
+    parser.add_argument("--seeds", default=",".join(str(seed) for seed in SEEDS))
+    parser.add_argument("--timeout", type=float, default=60.0,
+                        help="virtual seconds allowed per mission")
+    args = parser.parse_args()
+
+    seeds = [int(seed) for seed in args.seeds.split(",")]
+    runs = [benchmark(name, seed, args.timeout) for name in ASSIGNMENTS for seed in seeds]
+    summary = summarise(runs)
+    results = {
+        "commit": gitCommit(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "seeds": seeds,
+        "summary": summary,
+        "runs": runs,
+    }
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+
+    printSummary(summary)
+    for run in runs:
+        if run["error"]:
+            print("%s seed %d: %s" % (run["assignment"], run["seed"], run["error"]))
+    print("results written to %s" % args.output)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if baseline.get("seeds") != seeds:
+            print("NOT COMPARED: %s was run with seeds %s, this run with %s; rerun with --seeds %s"
+                  % (args.compare, baseline.get("seeds"), seeds,
+                     ",".join(str(seed) for seed in baseline.get("seeds") or [])))
+            sys.exit(2)
+        if compare(summary, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
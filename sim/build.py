@@ -0,0 +1,235 @@
+# ---------------------------------------------------------------------------- #
+#                                                                              #
+# 	Module:       build.py                                                     #
+# 	Created:      10/18/2026                                                   #
+# 	Description:  Bundle the shared robot library into each main.py            #
+#                                                                              #
+# ---------------------------------------------------------------------------- #
+
+# Usage:
+#   python sim/build.py
+#   python sim/build.py A8_TransportChallenge/src/main.py --mpy
+#
+# The brain runs a single file, so each assignment's main.py imports the
+# shared library with "from robot import *" and this script replaces that
+# line with the parts of lib/robot.py the script actually uses: every
+# top-level definition a kept statement names, starting from the script's
+# own code. The result has its comments and docstrings stripped and is
+# written to the project's build/main.py, which is the file to download:
+# each project's .vscode/vex_project_settings.json points the VEX extension
+# at it, so build before downloading.
+# --mpy also precompiles it to build/main.mpy with mpy-cross, for runtimes
+# that load precompiled MicroPython files.
+#
+# For each script it prints the download size and the host compile time
+# (a stand-in for the brain's parse time at program start) of the old
+# single file that carried the whole library and of the build.
+
+import argparse
+import ast
+import glob
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+
+SIM_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(SIM_DIR)
+LIBRARY = os.path.join(ROOT, "lib", "robot.py")
+
+IMPORT_LINE = re.compile(r"^from robot import \*.*$", re.MULTILINE)
+COMPILE_REPEATS = 50    # Compile timings keep the fastest of this many
+
+
+def definedNames(node):
+    # Names a top-level statement binds, not counting ones inside functions
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return {node.name}
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        return {alias.asname or alias.name.split(".")[0] for alias in node.names
+                if alias.name != "*"}
+    names = set()
+    pending = [node]
+    while pending:
+        child = pending.pop()
+        if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store):
+            names.add(child.id)
+        elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(child.name)
+            continue
+        elif isinstance(child, ast.Lambda):
+            continue
+        pending.extend(ast.iter_child_nodes(child))
+    return names
+
+
+def usedNames(node):
+    # Every name a statement mentions anywhere; an over-estimate is harmless
+    names = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name):
+            names.add(child.id)
+        elif isinstance(child, (ast.Global, ast.Nonlocal)):
+            names.update(child.names)
+    return names
+
+
+def chunks(source):
+    """
+    Split a module into its top-level statements, each with the comments
+    and blank lines above it: a list of (text, statement).
+    """
+    lines = source.splitlines(keepends=True)
+    tree = ast.parse(source)
+    result = []
+    start = 0
+    for node in tree.body:
+        end = node.end_lineno
+        result.append(("".join(lines[start:end]), node))
+        start = end
+    return result
+
+
+def shake(library, roots, replaced=(), skip=()):
+    """
+    Keep the library statements that define a name in roots or in a kept
+    statement, plus any statement that defines nothing. Statements defining
+    only names in replaced are dropped, as are imports whose code is in skip.
+    """
+    pieces = chunks(library)
+    needed = set(roots)
+    keep = [False] * len(pieces)
+    changed = True
+    while changed:
+        changed = False
+        for index, (text, node) in enumerate(pieces):
+            if keep[index]:
+                continue
+            if isinstance(node, (ast.Import, ast.ImportFrom)) and ast.unparse(node) in skip:
+                continue
+            names = definedNames(node) - set(replaced)
+            if definedNames(node) and not names:
+                continue
+            if not names or names & needed:
+                keep[index] = True
+                needed |= usedNames(node)
+                changed = True
+    return "".join(text for (text, node), kept in zip(pieces, keep) if kept)
+
+
+def bundle(source, library=LIBRARY, treeShake=True):
+    """
+    Replace the "from robot import *" line of a script with the library code
+    it uses (or all of it without treeShake). Scripts that don't import the
+    library come back unchanged.
+    """
+    match = IMPORT_LINE.search(source)
+    if match is None:
+        return source
+    with open(library) as file:
+        code = file.read()
+
+    script = source[:match.start()] + source[match.end():]
+    tree = ast.parse(script)
+    imports = {ast.unparse(node) for node in tree.body
+               if isinstance(node, (ast.Import, ast.ImportFrom))}
+    defined = set()
+    for node in tree.body:
+        defined |= definedNames(node)
+    if treeShake:
+        code = shake(code, usedNames(tree), defined, imports)
+    else:
+        code = "".join(text for text, node in chunks(code)
+                       if ast.unparse(node) not in imports)
+    return source[:match.start()] + code.strip("\n") + "\n" + source[match.end():]
+
+
+def strip(source):
+    # Drop comments and docstrings; blank lines go with them
+    tree = ast.parse(source)
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        first = node.body[0] if node.body else None
+        if (isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant)
+                and isinstance(first.value.value, str)):
+            node.body = node.body[1:] or [ast.Pass()]
+    return ast.unparse(tree) + "\n"
+
+
+def compileTime(source):
+    # Fastest host compile of the source, in milliseconds
+    best = None
+    for _ in range(COMPILE_REPEATS):
+        start = time.perf_counter()
+        compile(source, "main.py", "exec")
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def precompile(path, mpyCross):
+    output = os.path.splitext(path)[0] + ".mpy"
+    subprocess.check_call([mpyCross, "-o", output, path])
+    return output
+
+
+def build(path, args):
+    with open(path) as file:
+        source = file.read()
+    before = bundle(source, treeShake=False)
+    after = bundle(source, treeShake=not args.no_shake)
+    if not args.keep_comments:
+        after = strip(after)
+
+    folder = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(path))), "build")
+    os.makedirs(folder, exist_ok=True)
+    output = os.path.join(folder, "main.py")
+    with open(output, "w") as file:
+        file.write(after)
+
+    row = {
+        "script": path,
+        "output": output,
+        "beforeSize": len(before.encode()),
+        "afterSize": len(after.encode()),
+        "beforeCompile": compileTime(before),
+        "afterCompile": compileTime(after),
+        "mpySize": None,
+    }
+    if args.mpy:
+        row["mpySize"] = os.path.getsize(precompile(output, args.mpy_cross))
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("scripts", nargs="*",
+                        help="main.py files to build (default every project)")
+    parser.add_argument("--no-shake", action="store_true",
+                        help="bundle the whole library instead of what each script uses")
+    parser.add_argument("--keep-comments", action="store_true",
+                        help="leave comments and docstrings in")
+    parser.add_argument("--mpy", action="store_true",
+                        help="also precompile each build with mpy-cross")
+    parser.add_argument("--mpy-cross", default="mpy-cross", help="mpy-cross executable")
+    args = parser.parse_args()
+
+    if args.mpy and shutil.which(args.mpy_cross) is None:
+        parser.error("%s not found (pip install mpy-cross)" % args.mpy_cross)
+    scripts = args.scripts or sorted(glob.glob(os.path.join(ROOT, "*", "src", "main.py")))
+
+    print("%-26s %17s %19s %10s" % ("script", "download bytes", "compile ms (host)", "mpy bytes"))
+    for path in scripts:
+        row = build(path, args)
+        name = os.path.basename(os.path.dirname(os.path.dirname(os.path.abspath(path))))
+        print("%-26s %7d -> %6d %8.2f -> %6.2f %10s" % (
+            name, row["beforeSize"], row["afterSize"], row["beforeCompile"],
+            row["afterCompile"], row["mpySize"] or "-"))
+    print("builds written to each project's build/ folder")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
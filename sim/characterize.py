@@ -0,0 +1,188 @@
+# ---------------------------------------------------------------------------- #
+#                                                                              #
+# 	Module:       characterize.py                                              #
+# 	Created:      10/18/2026                                                   #
+# 	Description:  Fit drivetrain feedforward from a characterization log       #
+#                                                                              #
+# ---------------------------------------------------------------------------- #
+
+# Usage:
+#   python sim/run.py DriveCharacterization/src/main.py --sdcard logs
+#   python sim/characterize.py logs/DriveCharacterization/characterize.bin
+#
+# Reads the characterize.bin log DriveCharacterization writes and fits, for
+# each side of the drive, volts = kS + kV * velocity + kA * acceleration by
+# least squares over the straight tests, with velocity in motor degrees per
+# second and acceleration from its slope. Samples slower than --min-speed
+# are left out, since static friction doesn't follow the model there. The
+# spin tests give the effective track width: the inches the wheels travelled
+# in opposite directions over the radians the inertial sensor turned, which
+# includes any wheel scrub. The fitted values are printed ready to paste into
+# lib/robot.py.
+
+import argparse
+import math
+import struct
+
+MAGIC = b"VXCH"
+VERSION = 1
+HEADER_FORMAT = "<4sHH"
+RECORD_FORMAT = "<IBB7f"
+FIELDS = ("time", "test", "driving", "rightVolts", "leftVolts", "right", "left",
+          "rightSpeed", "leftSpeed", "rotation")
+
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+WHEEL_DIAMETER = 4.0    # Inches, as in lib/robot.py
+SLOPE_SPAN = 2          # Samples either side used for the acceleration
+MIN_SPEED = 30.0        # Motor degrees per second
+
+
+def decode(data):
+    """
+    Decode a log (bytes or a file path) into a list of dicts keyed by FIELDS,
+    with times in seconds from the first record.
+    """
+    if isinstance(data, str):
+        with open(data, "rb") as file:
+            data = file.read()
+    if len(data) < HEADER_SIZE:
+        raise ValueError("characterization log is too short for its header")
+    magic, version, size = struct.unpack_from(HEADER_FORMAT, data)
+    if magic != MAGIC:
+        raise ValueError("not a characterization log (magic %r)" % magic)
+    if version != VERSION or size != RECORD_SIZE:
+        raise ValueError("unsupported characterization log version %d, record size %d" % (version, size))
+
+    records = []
+    offset = 0
+    previous = None
+    for k in range((len(data) - HEADER_SIZE) // RECORD_SIZE):
+        record = dict(zip(FIELDS, struct.unpack_from(RECORD_FORMAT, data, HEADER_SIZE + k * RECORD_SIZE)))
+        if previous is not None and record["time"] < previous:
+            offset += 1 << 32   # The microsecond clock wrapped
+        previous = record["time"]
+        record["time"] = record["time"] + offset
+        records.append(record)
+    if records:
+        start = records[0]["time"]
+        for record in records:
+            record["time"] = (record["time"] - start) / 1000000
+    return records
+
+
+def tests(records):
+    # Group the records by test number, in log order
+    groups = {}
+    for record in records:
+        groups.setdefault(record["test"], []).append(record)
+    return [groups[number] for number in sorted(groups)]
+
+
+def samples(test, side, minSpeed=MIN_SPEED):
+    """
+    (volts, velocity, acceleration) for every driving sample of one side
+    fast enough to fit, with the acceleration from the speed's slope over
+    SLOPE_SPAN samples either side.
+    """
+    rows = []
+    for k in range(SLOPE_SPAN, len(test) - SLOPE_SPAN):
+        record = test[k]
+        before = test[k - SLOPE_SPAN]
+        after = test[k + SLOPE_SPAN]
+        if not record["driving"] or abs(record[side + "Speed"]) < minSpeed:
+            continue
+        seconds = after["time"] - before["time"]
+        if seconds <= 0:
+            continue
+        accel = (after[side + "Speed"] - before[side + "Speed"]) / seconds
+        rows.append((record[side + "Volts"], record[side + "Speed"], accel))
+    return rows
+
+
+def solve(matrix, vector):
+    # Gaussian elimination with partial pivoting
+    n = len(vector)
+    rows = [list(matrix[i]) + [vector[i]] for i in range(n)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(rows[r][col]))
+        if abs(rows[pivot][col]) < 1e-12:
+            raise ValueError("not enough variety in the log to fit the model")
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for r in range(col + 1, n):
+            factor = rows[r][col] / rows[col][col]
+            for c in range(col, n + 1):
+                rows[r][c] -= factor * rows[col][c]
+    solution = [0.0] * n
+    for r in range(n - 1, -1, -1):
+        solution[r] = (rows[r][n] - sum(rows[r][c] * solution[c] for c in range(r + 1, n))) / rows[r][r]
+    return solution
+
+
+def fit(rows):
+    """
+    Least squares kS, kV, kA and the R squared of the fit for rows of
+    (volts, velocity, acceleration).
+    """
+    if len(rows) < 3:
+        raise ValueError("only %d usable samples; is this a full log?" % len(rows))
+    features = [(math.copysign(1, v), v, a) for _, v, a in rows]
+    matrix = [[sum(f[i] * f[j] for f in features) for j in range(3)] for i in range(3)]
+    vector = [sum(f[i] * row[0] for f, row in zip(features, rows)) for i in range(3)]
+    kS, kV, kA = solve(matrix, vector)
+
+    mean = sum(row[0] for row in rows) / len(rows)
+    total = sum((row[0] - mean) ** 2 for row in rows)
+    residual = sum((row[0] - (kS * f[0] + kV * f[1] + kA * f[2])) ** 2
+                   for f, row in zip(features, rows))
+    return kS, kV, kA, 1 - residual / total if total else 1.0
+
+
+def trackWidth(spins, wheelDiameter):
+    # Effective track width in inches over all the spin tests
+    inchesPerDegree = math.pi * wheelDiameter / 360
+    wheels = 0.0
+    turned = 0.0
+    for test in spins:
+        first, last = test[0], test[-1]
+        wheels += (abs(last["right"] - first["right"]) + abs(last["left"] - first["left"])) * inchesPerDegree
+        turned += abs(math.radians(last["rotation"] - first["rotation"]))
+    return wheels / turned if turned else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("log", help="characterize.bin from the SD card")
+    parser.add_argument("--wheel-diameter", type=float, default=WHEEL_DIAMETER,
+                        help="inches, for the track width")
+    parser.add_argument("--min-speed", type=float, default=MIN_SPEED,
+                        help="motor degrees per second below which samples are left out")
+    args = parser.parse_args()
+
+    # Spins drive the two sides in opposite directions
+    groups = tests(decode(args.log))
+    spins = [test for test in groups if any(r["rightVolts"] * r["leftVolts"] < 0 for r in test)]
+    straight = [test for test in groups if test not in spins]
+
+    values = {}
+    for side in ("right", "left"):
+        rows = [row for test in straight for row in samples(test, side, args.min_speed)]
+        kS, kV, kA, r2 = fit(rows)
+        values[side] = (kS, kV, kA)
+        print("%-6s kS %.3f V  kV %.5f V/(deg/s)  kA %.6f V/(deg/s^2)  r^2 %.4f  (%d samples)" % (
+            side, kS, kV, kA, r2, len(rows)))
+    width = trackWidth(spins, args.wheel_diameter)
+    if width is not None:
+        print("track width %.2f in, effective, from %d spins" % (width, len(spins)))
+
+    print()
+    print("# Fitted by sim/characterize.py from %s: (right, left)" % args.log)
+    for index, name in enumerate(("DRIVE_KS", "DRIVE_KV", "DRIVE_KA")):
+        print("%s = (%.4g, %.4g)" % (name, values["right"][index], values["left"][index]))
+    if width is not None:
+        print("TRACK_WIDTH = %.2f" % width)
+
+
+if __name__ == "__main__":
+    main()
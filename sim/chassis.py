@@ -0,0 +1,224 @@
+# ---------------------------------------------------------------------------- #
+#                                                                              #
+# 	Module:       chassis.py                                                   #
+# 	Created:      10/18/2026                                                   #
+# 	Description:  Physics models behind the headless vex stand-in              #
+#                                                                              #
+# ---------------------------------------------------------------------------- #
+
+# Everything in here works in the logical frame the VEX API reports: motor
+# shaft angle in degrees, shaft speed in rpm, field distances in inches.
+# The field frame has x pointing along the robot's starting direction, y to
+# its left, and theta counterclockwise in radians.
+
+import math
+import random
+
+# Motor cartridge free speeds (rpm at 100% velocity)
+CARTRIDGE_RPM = {"36_1": 100, "18_1": 200, "6_1": 600}
+
+# Electrical / mechanical constants for a V5 smart motor (18:1 cartridge).
+# kS, kV and kA use the usual feedforward form: volts = kS + kV*w + kA*dw/dt
+MOTOR_KS = 0.6          # Volts needed to break static friction
+MOTOR_KV = 0.055        # Volts per rpm
+MOTOR_KA = 0.0066       # Volts per rpm/s with half the chassis as load
+MOTOR_MAX_VOLTS = 12.0  # Motor output ceiling
+MOTOR_RESISTANCE = 2.0  # Ohms, for the battery current estimate
+MOTOR_MAX_AMPS = 2.5    # Firmware current limit
+
+# Gains of the motor's built-in controllers
+VELOCITY_KP = 0.08      # Volts per rpm of velocity error
+BRAKE_KP = 0.3          # Volts per rpm while braking
+HOLD_KP = 0.15          # Volts per degree of position error in HOLD
+HOLD_KD = 0.02          # Volts per rpm of damping in HOLD
+
+# Battery model
+BATTERY_FULL = 12.8         # Open-circuit volts when charged
+BATTERY_EMPTY = 11.4        # Open-circuit volts when flat
+BATTERY_CAPACITY = 1.1 * 3600   # Amp-seconds (1100 mAh)
+BATTERY_RESISTANCE = 0.15   # Ohms
+BATTERY_HEADROOM = 0.92     # Fraction of battery volts a motor can apply
+VOLTAGE_SCALE = 12.0        # A voltage-mode command is a fraction of this, applied
+                            # to the battery, so it isn't compensated for charge.
+                            # Assumed, not measured on a V5 motor
+
+# Chassis geometry
+WHEEL_DIAMETER = 4.0    # Inches
+TRACK_WIDTH = 11.0      # Inches between wheel centres (halfWidth = 5.5)
+TURN_SCRUB = 1.1        # Effective track width grows when the wheels scrub
+TRACTION_LIMIT = 300.0  # Max wheel acceleration in in/s^2 before slipping
+
+# Lift arm
+LIFT_RATIO = 5.0        # Motor degrees per arm degree
+LIFT_GRAVITY = 0.8      # Volts of gravity load with the arm horizontal
+LIFT_KA = 0.0025        # Lighter load than the drive
+LIFT_MIN = -10.0        # Hard stops relative to the starting angle
+LIFT_MAX = 120.0
+
+# Inertial sensor
+GYRO_DRIFT = 0.01       # Degrees per second of bias drift
+GYRO_NOISE = 0.02       # Degrees of heading noise per sample
+
+
+def clamp(value, low, high):
+    return max(low, min(high, value))
+
+
+class Battery:
+    def __init__(self, charge=1.0):
+        self.charge = clamp(charge, 0.0, 1.0)   # Fraction of capacity left
+        self.current = 0.0                      # Amps drawn this step
+
+    def openCircuit(self):
+        return BATTERY_EMPTY + (BATTERY_FULL - BATTERY_EMPTY) * self.charge
+
+    def voltage(self):
+        return self.openCircuit() - self.current * BATTERY_RESISTANCE
+
+    def capacity(self):
+        return self.charge * 100
+
+    def step(self, current, dt):
+        self.current = current
+        self.charge = max(0.0, self.charge - current * dt / BATTERY_CAPACITY)
+
+
+class MotorModel:
+    """
+    One smart motor: its built-in velocity / brake / hold controllers and a
+    kS/kV/kA plant. mount is +1 when logical forward moves the mechanism
+    forward and -1 when the motor is mounted mirrored.
+    """
+
+    def __init__(self, rpm=200, kS=MOTOR_KS, kV=MOTOR_KV, kA=MOTOR_KA,
+                 mount=1):
+        self.rpm = rpm
+        self.kS = kS
+        self.kV = kV * 200 / rpm
+        self.kA = kA * 200 / rpm
+        self.mount = mount
+        self.reversed = False
+
+        self.mode = "stop"      # "velocity", "voltage" or "stop"
+        self.target = 0.0       # rpm in velocity mode, volts in voltage mode
+        self.stopping = "coast"
+        self.holdAngle = 0.0
+
+        self.angle = 0.0        # Shaft degrees in the logical frame
+        self.speed = 0.0        # Shaft rpm in the logical frame
+        self.volts = 0.0        # Applied volts this step
+        self.load = 0.0         # External load in volts (gravity etc.)
+        self.accelLimit = None  # rpm/s, set by whatever the motor drives
+
+    def sign(self):
+        # Logical frame -> mechanism frame
+        return self.mount * (-1 if self.reversed else 1)
+
+    def current(self):
+        back = self.kV * self.speed
+        return min(MOTOR_MAX_AMPS, abs(self.volts - back) / MOTOR_RESISTANCE)
+
+    def command(self, available, supply):
+        if self.mode == "velocity":
+            feedforward = MOTOR_KV * 200 / self.rpm * self.target
+            if self.target:
+                feedforward += math.copysign(MOTOR_KS, self.target)
+            volts = feedforward + VELOCITY_KP * (self.target - self.speed)
+        elif self.mode == "voltage":
+            volts = self.target * supply / VOLTAGE_SCALE
+        elif self.stopping == "brake":
+            volts = -BRAKE_KP * self.speed
+        elif self.stopping == "hold":
+            volts = HOLD_KP * (self.holdAngle - self.angle) - HOLD_KD * self.speed
+            volts += self.load
+        else:
+            volts = 0.0
+        return clamp(volts, -available, available)
+
+    def step(self, dt, available, supply):
+        self.volts = self.command(available, supply)
+        net = self.volts - self.load - self.kV * self.speed
+        if self.speed == 0 and abs(net) <= self.kS:
+            return
+        net -= math.copysign(self.kS, self.speed if self.speed else net)
+        accel = net / self.kA
+        if self.accelLimit is not None:
+            accel = clamp(accel, -self.accelLimit, self.accelLimit)
+        speed = self.speed + accel * dt
+
+        # Friction and braking stop the shaft rather than reversing it
+        if self.mode == "stop" and self.stopping != "hold" and speed * self.speed < 0:
+            speed = 0.0
+        if self.mode == "stop" and self.stopping == "brake" and abs(speed) < 1:
+            speed = 0.0
+        self.angle += (self.speed + speed) / 2 * 6 * dt
+        self.speed = speed
+
+
+class Chassis:
+    """
+    Differential drive with one motor per side and a motor-driven lift arm.
+    """
+
+    def __init__(self, seed=0, battery=1.0, mismatch=0.03):
+        self.rng = random.Random(seed)
+        self.battery = Battery(battery)
+
+        wheelRpm = TRACTION_LIMIT / (math.pi * WHEEL_DIAMETER) * 60
+        self.right = MotorModel(mount=1)
+        self.left = MotorModel(mount=-1, kV=MOTOR_KV * (1 + mismatch))
+        self.right.accelLimit = wheelRpm
+        self.left.accelLimit = wheelRpm
+        self.lift = MotorModel(mount=1, kA=LIFT_KA)
+
+        self.x = 0.0
+        self.y = 0.0
+        self.theta = 0.0        # Counterclockwise radians
+        self.omega = 0.0        # Counterclockwise rad/s
+        self.velocity = 0.0     # Forward in/s
+        self.path = 0.0         # Total distance travelled in inches
+
+        self.armAngle = 0.0     # Arm degrees relative to the start
+        self.gyroBias = 0.0
+
+    def wheelSpeed(self, motor):
+        # Shaft rpm -> wheel surface speed in in/s along the robot's x axis
+        return motor.speed * motor.sign() * math.pi * WHEEL_DIAMETER / 60
+
+    def heading(self):
+        # VEX convention: clockwise degrees
+        return -math.degrees(self.theta) + self.gyroBias
+
+    def step(self, dt):
+        supply = self.battery.voltage()
+        available = min(MOTOR_MAX_VOLTS, supply * BATTERY_HEADROOM)
+
+        gravity = LIFT_GRAVITY * math.cos(math.radians(self.armAngle)) / LIFT_RATIO
+        self.lift.load = gravity * self.lift.sign()
+        for motor in (self.right, self.left, self.lift):
+            motor.step(dt, available, supply)
+
+        # Lift arm against its hard stops
+        self.armAngle = self.lift.angle * self.lift.sign() / LIFT_RATIO
+        if not LIFT_MIN <= self.armAngle <= LIFT_MAX:
+            self.armAngle = clamp(self.armAngle, LIFT_MIN, LIFT_MAX)
+            self.lift.angle = self.armAngle * LIFT_RATIO * self.lift.sign()
+            self.lift.speed = 0.0
+
+        # Differential-drive kinematics
+        vr = self.wheelSpeed(self.right)
+        vl = self.wheelSpeed(self.left)
+        self.velocity = (vr + vl) / 2
+        self.omega = (vr - vl) / (TRACK_WIDTH * TURN_SCRUB)
+        midTheta = self.theta + self.omega * dt / 2
+        self.x += self.velocity * math.cos(midTheta) * dt
+        self.y += self.velocity * math.sin(midTheta) * dt
+        self.theta += self.omega * dt
+        self.path += abs(self.velocity) * dt
+        self.gyroBias += GYRO_DRIFT * dt
+
+        current = 0.05 + sum(m.current() for m in (self.right, self.left, self.lift))
+        self.battery.step(current, dt)
+
+    def noise(self, scale):
+        return self.rng.gauss(0.0, scale)
@@ -0,0 +1,339 @@
+# ---------------------------------------------------------------------------- #
+#                                                                              #
+# 	Module:       plan.py                                                      #
+# 	Created:      10/18/2026                                                   #
+# 	Description:  Plan a minimum-time route for a transport field              #
+#                                                                              #
+# ---------------------------------------------------------------------------- #
+
+# Usage:
+#   python sim/plan.py
+#   python sim/plan.py --obstacle 40,-50,55,-30 --simulate
+#
+# A field is a start pose, a list of stops (pose, straight approach, lift
+# moves) and rectangular obstacles, all in the route frame: inches from the
+# start with x forward and y to the left, headings clockwise in degrees.
+# Poses are fixed, so each leg between two stops is planned on its own: the
+# robot can back off the stop first, then either turn, drive and turn or
+# follow a path (forwards or backwards) to the next stop's approach line.
+# Every option is timed with the robot library's own motion profiles, and
+# the fastest one that keeps clear of the obstacles wins.
+#
+# The planner prints the route ready to paste into main.py with its
+# predicted mission time, and the prediction for the route main.py has now.
+# --simulate also runs the planned route in the simulator.
+
+import argparse
+import ast
+import contextlib
+import io
+import math
+import os
+import sys
+import tempfile
+
+SIM_DIR = os.path.dirname(os.path.abspath(__file__))
+if SIM_DIR not in sys.path:
+    sys.path.insert(0, SIM_DIR)
+
+import build  # noqa: E402
+import vex  # noqa: E402
+from run import poseError, runMission  # noqa: E402
+
+ROOT = os.path.dirname(SIM_DIR)
+
+# Fields: stops are (name, (x, y, heading), approach inches driven straight
+# in, lift degrees at the stop, lift degrees started while leaving it).
+# Obstacles are (x0, y0, x1, y1) rectangles.
+FIELDS = {
+    "A8_TransportChallenge": {
+        "start": (0.0, 0.0, 0.0),
+        "stops": [
+            ("pickup", (73.0, 0.0, 0.0), 12.0, 50, 0),
+            ("dropoff", (69.95, -77.26, 56.0), 16.0, -50, 50),
+            ("finish", (84.87, -25.19, 90.0), 0.0, 0, 0),
+        ],
+        "obstacles": [],
+        "velocities": (50, 40, 30),     # Drive, turn and lift percent, as in main()
+    },
+}
+
+BACKOFFS = (0, 6, 12, 18)   # Inches to reverse off a stop before turning
+CLEARANCE = 9.0             # Inches from the robot's centre to its corners
+MIN_TURN = 0.5              # Degrees; smaller turns are left out
+MIN_MOVE = 1.0              # Inches; shorter moves are left out
+SETTLE_ESTIMATE = 0.1       # Seconds a SETTLE step waits, from the route reports
+LIFT_SETTLE_ESTIMATE = 0.05
+
+POLICIES = {"SETTLE": "settle", "BLEND": "blend", "PARALLEL": "parallel"}
+
+
+def loadLibrary():
+    """
+    Run lib/robot.py against a throwaway simulation and return its names,
+    for the motion profile and path timing code.
+    """
+    sim = vex.startSimulation()
+    names = {"__name__": "robot"}
+    try:
+        with open(build.LIBRARY) as file:
+            exec(compile(file.read(), build.LIBRARY, "exec"), names)
+    finally:
+        sim.shutdown()
+    return names
+
+
+def wrap(angle):
+    return (angle + 180) % 360 - 180
+
+
+def bearing(x0, y0, x1, y1):
+    # Clockwise heading from one point to another
+    return -math.degrees(math.atan2(y1 - y0, x1 - x0))
+
+
+def ahead(pose, distance):
+    x, y, heading = pose
+    theta = -math.radians(heading)
+    return x + distance * math.cos(theta), y + distance * math.sin(theta)
+
+
+def blocked(points, obstacles):
+    for x, y in points:
+        for x0, y0, x1, y1 in obstacles:
+            if (min(x0, x1) - CLEARANCE <= x <= max(x0, x1) + CLEARANCE
+                    and min(y0, y1) - CLEARANCE <= y <= max(y0, y1) + CLEARANCE):
+                return True
+    return False
+
+
+def line(x0, y0, x1, y1):
+    steps = max(1, int(math.hypot(x1 - x0, y1 - y0)))
+    return [(x0 + (x1 - x0) * k / steps, y0 + (y1 - y0) * k / steps) for k in range(steps + 1)]
+
+
+def predict(route, start, lib, velocities, obstacles=()):
+    """
+    Walk a route from a start pose with the library's motion profiles and
+    return (seconds, final pose, whether it hits an obstacle).
+    """
+    drive, turn, lift = velocities
+    percent = lib["PERCENT_DPS"] * lib["calibration"].inchesPerDegree()
+    x, y, heading = start
+    time = 0.0
+    liftDone = None         # When a parallel lift finishes
+    hit = False
+    for action, amount, policy in route:
+        if liftDone is not None and action in ("lift", "wait"):
+            time = max(time, liftDone)
+            liftDone = None
+        settle = SETTLE_ESTIMATE if policy == "settle" else 0
+        if action == "drive":
+            x1, y1 = ahead((x, y, heading), amount)
+            hit = hit or blocked(line(x, y, x1, y1), obstacles)
+            time += lib["driveTime"](abs(amount), drive) + settle
+            x, y = x1, y1
+        elif action == "turn":
+            time += lib["pointTurnTime"](abs(amount), turn) + settle
+            heading -= amount
+        elif action in ("path", "reverse"):
+            path = lib["Path"]([(x, y)] + list(amount), drive * percent,
+                               lib["MIN_VELOCITY"] * percent)
+            hit = hit or blocked(zip(path.x, path.y), obstacles)
+            time += path.duration() + settle
+            x0, y0 = amount[-2] if len(amount) > 1 else (x, y)
+            x, y = amount[-1]
+            heading = bearing(x0, y0, x, y) + (180 if action == "reverse" else 0)
+        elif action == "lift":
+            seconds = lib["MotionProfile"](abs(amount), lift * lib["LIFT_DPS"], lib["LIFT_ACCEL"],
+                                           lib["LIFT_JERK"]).duration()
+            if policy == "parallel":
+                liftDone = time + seconds
+            else:
+                time += seconds + (LIFT_SETTLE_ESTIMATE if policy == "settle" else 0)
+        elif action == "wait":
+            time += amount
+    if liftDone is not None:
+        time = max(time, liftDone)
+    return time, (x, y, heading), hit
+
+
+def turnStep(angle, policy="blend"):
+    # Route turn (positive left) from a clockwise heading change
+    angle = wrap(angle)
+    return [("turn", -angle, policy)] if abs(angle) >= MIN_TURN else []
+
+
+def legOptions(pose, stop, obstacles=()):
+    """
+    Every way this planner knows from a pose to a stop: (name, steps). The
+    last step settles so the stop's pose is accurate.
+    """
+    _, target, approach, _, _ = stop
+    margin = CLEARANCE + 1
+    corners = [(cx + margin * (1 if cx == max(x0, x1) else -1),
+                cy + margin * (1 if cy == max(y0, y1) else -1))
+               for x0, y0, x1, y1 in obstacles for cx in (x0, x1) for cy in (y0, y1)]
+    options = []
+    for backoff in BACKOFFS:
+        x, y = ahead(pose, -backoff)
+        heading = pose[2]
+        steps = [("drive", -backoff, "blend")] if backoff else []
+        ax, ay = ahead(target, -approach)
+        finish = [("drive", approach, "settle")] if approach >= MIN_MOVE else []
+        distance = math.hypot(ax - x, ay - y)
+        if distance < MIN_MOVE:
+            continue
+        toApproach = bearing(x, y, ax, ay)
+
+        for reverse in (False, True):
+            facing = toApproach + (180 if reverse else 0)
+            direction = "reverse" if reverse else "forward"
+
+            # Turn, drive straight, turn onto the approach line
+            moves = (steps + turnStep(facing - heading)
+                     + [("drive", -distance if reverse else distance, "blend")]
+                     + turnStep(target[2] - facing))
+            options.append(("back %d, turn-drive-turn %s" % (backoff, direction),
+                            settleLast(moves + finish)))
+
+            # Turn to the first leg and follow a path onto the approach line,
+            # straight there or around an obstacle corner
+            for via in [None] + corners:
+                points = ([via] if via else []) + [(ax, ay)]
+                points += [target[:2]] if approach >= MIN_MOVE else []
+                first = bearing(x, y, *points[0]) + (180 if reverse else 0)
+                end = bearing(*points[-2], *points[-1]) if len(points) > 1 else first
+                end += 180 if reverse and len(points) > 1 else 0
+                moves = (steps + turnStep(first - heading)
+                         + [("reverse" if reverse else "path", points, "blend")]
+                         + turnStep(target[2] - end))
+                options.append(("back %d, path %s%s" % (backoff, direction, " via corner" if via else ""),
+                                settleLast(moves)))
+    return options
+
+
+def settleLast(steps):
+    action, amount, _ = steps[-1]
+    return steps[:-1] + [(action, amount, "settle")]
+
+
+def plan(field, lib, velocities, obstacles):
+    """
+    Fastest clear option for every leg; returns (route, [(stop, option, seconds)]).
+    """
+    route = []
+    legs = []
+    pose = field["start"]
+    leaving = 0             # Lift started while leaving the previous stop
+    for stop in field["stops"]:
+        start = [("lift", leaving, "parallel")] if leaving else []
+        best = None
+        for name, steps in legOptions(pose, stop, obstacles):
+            seconds, end, hit = predict(start + steps, pose, lib, velocities, obstacles)
+            if not hit and (best is None or seconds < best[1]):
+                best = (name, seconds, steps)
+        if best is None:
+            raise ValueError("no clear way to %s" % stop[0])
+
+        route += start + best[2]
+        legs.append((stop[0], best[0], best[1]))
+        if stop[3]:
+            route.append(("lift", stop[3], "settle"))
+        pose = stop[1]
+        leaving = stop[4]
+    return route, legs
+
+
+def formatAmount(amount):
+    if isinstance(amount, list):
+        return "[%s]" % ", ".join("(%.2f, %.2f)" % point for point in amount)
+    return "%g" % round(amount, 2)
+
+
+def formatRoute(route, indent="    "):
+    names = {value: name for name, value in POLICIES.items()}
+    lines = [indent + "route = ["]
+    for action, amount, policy in route:
+        lines.append("%s    (%r, %s, %s)," % (indent, action, formatAmount(amount), names[policy]))
+    lines.append(indent + "]")
+    return "\n".join(lines)
+
+
+def findRoute(source):
+    # The route = [...] assignment in main(): (node, route)
+    for node in ast.walk(ast.parse(source)):
+        if (isinstance(node, ast.Assign) and isinstance(node.value, ast.List)
+                and any(isinstance(target, ast.Name) and target.id == "route"
+                        for target in node.targets)):
+            return node, eval(compile(ast.Expression(node.value), "main.py", "eval"), dict(POLICIES))
+    return None, None
+
+
+def simulate(path, route):
+    # Run main.py with its route swapped for this one
+    with open(path) as file:
+        source = file.read()
+    node, _ = findRoute(source)
+    lines = source.splitlines(keepends=True)
+    text = formatRoute(route, " " * node.col_offset) + "\n"
+    source = "".join(lines[:node.lineno - 1]) + text + "".join(lines[node.end_lineno:])
+
+    # Same folder layout, so the result still finds its target pose
+    name = os.path.basename(os.path.dirname(os.path.dirname(os.path.abspath(path))))
+    with tempfile.TemporaryDirectory() as directory:
+        script = os.path.join(directory, name, "src", "main.py")
+        os.makedirs(os.path.dirname(script))
+        with open(script, "w") as file:
+            file.write(source)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return runMission(script)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("field", nargs="?", default="A8_TransportChallenge", choices=sorted(FIELDS))
+    parser.add_argument("--obstacle", action="append", default=[], metavar="X0,Y0,X1,Y1",
+                        help="extra rectangular obstacle in inches (repeatable)")
+    parser.add_argument("--simulate", action="store_true",
+                        help="run the planned route in the simulator")
+    args = parser.parse_args()
+
+    field = FIELDS[args.field]
+    obstacles = list(field["obstacles"])
+    for text in args.obstacle:
+        values = [float(value) for value in text.split(",")]
+        if len(values) != 4:
+            parser.error("obstacles are X0,Y0,X1,Y1")
+        obstacles.append(tuple(values))
+
+    lib = loadLibrary()
+    velocities = field["velocities"]
+    try:
+        route, legs = plan(field, lib, velocities, obstacles)
+    except ValueError as exc:
+        sys.exit(str(exc))
+    predicted = predict(route, field["start"], lib, velocities, obstacles)[0]
+
+    for stop, option, seconds in legs:
+        print("%-8s %-36s %5.2f s" % (stop, option, seconds))
+    print(formatRoute(route))
+    print("predicted mission time %.2f s" % predicted)
+
+    path = os.path.join(ROOT, args.field, "src", "main.py")
+    with open(path) as file:
+        _, current = findRoute(file.read())
+    if current is not None:
+        seconds, _, hit = predict(current, field["start"], lib, velocities, obstacles)
+        print("current route          %.2f s%s" % (seconds, " (hits an obstacle)" if hit else ""))
+
+    if args.simulate:
+        result = simulate(path, route)
+        error = poseError(result) or (0.0, 0.0)
+        print("simulated              %.2f s, finish %.2f in  %.1f deg from the target%s" % (
+            result["missionTime"], error[0], error[1],
+            "  (%s)" % result["error"] if result["error"] else ""))
+
+
+if __name__ == "__main__":
+    main()
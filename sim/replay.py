@@ -0,0 +1,204 @@
+# ---------------------------------------------------------------------------- #
+#                                                                              #
+# 	Module:       replay.py                                                    #
+# 	Created:      10/18/2026                                                   #
+# 	Description:  Drive a script from a recorded telemetry log                 #
+#                                                                              #
+# ---------------------------------------------------------------------------- #
+
+# Usage:
+#   python sim/replay.py telemetry.bin A8_TransportChallenge/src/main.py
+#   python sim/replay.py telemetry.bin A8_TransportChallenge/src/main.py --commands out.csv
+#
+# The script runs one mission against the simulator, but the drive encoders,
+# lift rotation sensor and inertial sensor read back the log instead of the
+# physics model. The log is split into moves wherever the recorded drive
+# command goes from stopped to moving, and each move the script starts is
+# lined up with the next one in the log; while the script holds the drive
+# stopped, the log holds just before its next move. A stop the script sends
+# and undoes within a control tick (a turn handing over to a blended path)
+# never reaches the log, so it doesn't start a new move. Every set_velocity /
+# spin / stop the script sends is captured, and the drive velocities it
+# commands are compared with the ones the log recorded, so a controller
+# change can be checked against a real run. The exit status is 1 when the mean difference is over --tolerance.
+# Drive feedforward only changes how a velocity command reaches the motors,
+# so the replay runs the drive in velocity mode, where the commands the
+# script sends are the velocities the log recorded.
+
+import argparse
+import bisect
+import contextlib
+import csv
+import io
+import os
+import re
+import sys
+
+SIM_DIR = os.path.dirname(os.path.abspath(__file__))
+if SIM_DIR not in sys.path:
+    sys.path.insert(0, SIM_DIR)
+
+import build  # noqa: E402
+import telemetry  # noqa: E402
+from run import runMission  # noqa: E402
+
+CHANNELS = ("right", "left", "rotation", "lift")
+RATE_WINDOW = 0.02      # Seconds the served velocities are averaged over
+# Once lined up, the command a record logged was sent on the tick before it,
+# and the next one lands right on the record's time, a few device calls
+# either side of it. Commands are compared half a tick before each record
+# so those few microseconds can't decide which of the two is picked.
+COMPARE_BEFORE = 0.005
+VELOCITY_MODE = {"DRIVE_KV": None}
+
+
+class Trace:
+    """
+    A decoded telemetry log, read back by time with linear interpolation.
+    Before the first record and after the last the ends are held. The log
+    has no velocities, so rates are the slope across RATE_WINDOW, which
+    keeps sensor noise from looking like motion.
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.times = list(columns["time"])
+        if not self.times:
+            raise ValueError("telemetry log has no records")
+
+        # Records where the drive goes from stopped to moving
+        self.moveStarts = []
+        moving = False
+        for k, time in enumerate(self.times):
+            commanded = columns["rightCommand"][k] != 0 or columns["leftCommand"][k] != 0
+            if commanded and not moving:
+                self.moveStarts.append(time)
+            moving = commanded
+
+    @classmethod
+    def load(cls, path):
+        return cls(telemetry.decode(path, arrays=False))
+
+    def duration(self):
+        return self.times[-1]
+
+    def moveStart(self, n):
+        # Time of the n-th drive move, or None past the last one
+        return self.moveStarts[n] if n < len(self.moveStarts) else None
+
+    def value(self, name, seconds):
+        times = self.times
+        column = self.columns[name]
+        k = bisect.bisect_right(times, seconds)
+        if k == 0:
+            return column[0]
+        if k == len(times):
+            return column[-1]
+        fraction = (seconds - times[k - 1]) / (times[k] - times[k - 1])
+        return column[k - 1] + (column[k] - column[k - 1]) * fraction
+
+    # Sensor values at a time; still=True reports every rate as zero
+    def at(self, seconds, still=False):
+        values = {}
+        for name in CHANNELS:
+            values[name] = self.value(name, seconds)
+            before = self.value(name, seconds - RATE_WINDOW / 2)
+            after = self.value(name, seconds + RATE_WINDOW / 2)
+            values[name + "Rate"] = 0.0 if still else (after - before) / RATE_WINDOW
+        return values
+
+    def command(self, role, seconds):
+        # Velocity the log recorded for a drive side at a time
+        k = max(bisect.bisect_right(self.times, seconds) - 1, 0)
+        return self.columns[role + "Command"][k]
+
+
+def commandedVelocities(commands):
+    """
+    Turn captured motor calls into (time, percent) steps per drive side, in
+    the same sign convention as the log: the velocity the side is spinning
+    at, or 0 once stopped.
+    """
+    steps = {"right": [], "left": []}
+    velocity = {"right": 50.0, "left": 50.0}
+    for time, role, method, args in commands:
+        if role not in steps:
+            continue
+        if method == "set_velocity":
+            velocity[role] = args[0]
+        elif method == "spin":
+            direction, value = args[0], args[1]
+            if value is not None:
+                velocity[role] = value
+            sign = 1 if direction == "FORWARD" else -1
+            steps[role].append((time, sign * velocity[role]))
+        elif method == "stop":
+            steps[role].append((time, 0.0))
+    return steps
+
+
+def compare(trace, steps):
+    # Mean and max difference between logged and replayed drive commands
+    results = {}
+    for role, changes in steps.items():
+        times = [time for time, _ in changes]
+        differences = []
+        for time in trace.times:
+            k = bisect.bisect_right(times, time - COMPARE_BEFORE) - 1
+            replayed = changes[k][1] if k >= 0 else 0.0
+            differences.append(abs(replayed - trace.command(role, time)))
+        results[role] = (sum(differences) / len(differences), max(differences))
+    return results
+
+
+def writeCommands(commands, path):
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["time", "motor", "method", "arguments"])
+        for time, role, method, args in commands:
+            writer.writerow(["%.4f" % time, role, method, " ".join(str(arg) for arg in args)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("log", help="telemetry.bin recorded on the robot")
+    parser.add_argument("script", help="main.py to drive from the log")
+    parser.add_argument("--commands", help="write the captured motor calls to this CSV file")
+    parser.add_argument("--tolerance", type=float, default=1.0,
+                        help="percent of mean command difference allowed")
+    parser.add_argument("--timeout", type=float, default=120.0,
+                        help="virtual seconds allowed for the mission")
+    parser.add_argument("--verbose", action="store_true", help="show the script's output")
+    args = parser.parse_args()
+
+    trace = Trace.load(args.log)
+    with open(args.script) as file:
+        feedforward = re.search(r"^DRIVE_KV = ", build.bundle(file.read()), re.MULTILINE)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+        result = runMission(args.script, VELOCITY_MODE if feedforward else None,
+                            trace=trace, timeout=args.timeout)
+
+    commands = result["commands"]
+    print("%s against %s" % (args.script, args.log))
+    if result["error"]:
+        print("  stopped        " + result["error"])
+    print("  log            %d records over %.2f s, %d moves" % (
+        len(trace.times), trace.duration(), len(trace.moveStarts)))
+    print("  captured       %d motor calls" % len(commands))
+    if args.commands:
+        writeCommands(commands, args.commands)
+        print("  wrote          %s" % args.commands)
+
+    worst = 0.0
+    for role, (mean, peak) in compare(trace, commandedVelocities(commands)).items():
+        print("  %-6s command  mean diff %.2f %%, max %.2f %%" % (role, mean, peak))
+        worst = max(worst, mean)
+    if worst > args.tolerance:
+        print("  FAILED: commands differ from the log by more than %.1f %%" % args.tolerance)
+        sys.exit(1)
+    print("  ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# ---------------------------------------------------------------------------- #
+#                                                                              #
+# 	Module:       run.py                                                       #
+# 	Created:      10/18/2026                                                   #
+# 	Description:  Run an assignment main.py against the simulated robot       #
+#                                                                              #
+# ---------------------------------------------------------------------------- #
+
+# Usage:
+#   python sim/run.py A8_TransportChallenge/src/main.py
+#   python sim/run.py A6_SentrySimulation/src/main.py --missions 2 --screen
+#   python sim/run.py Calibration/src/main.py --mark 48 --sdcard logs
+#   python sim/run.py A8_TransportChallenge/src/main.py --load logs/Calibration/calibration.txt
+
+import argparse
+import linecache
+import math
+import os
+import re
+import sys
+import time
+
+SIM_DIR = os.path.dirname(os.path.abspath(__file__))
+if SIM_DIR not in sys.path:
+    sys.path.insert(0, SIM_DIR)
+
+import build  # noqa: E402
+import vex  # noqa: E402
+
+# Where each assignment's route should leave the robot: (x, y, heading) in
+# the report's frame. A8 is worked out from the route's drives and turns.
+TARGETS = {
+    "A3_AutomaticStraightening": (120.0, 0.0, 0.0),
+    "A4_PointTurn": (0.0, 0.0, -180.0),
+    "A6_SentrySimulation": (0.0, 0.0, -360.0),
+    "A7_RotationSensor": (57.0, 0.0, 90.0),
+    "A8_TransportChallenge": (84.87, -25.19, 90.0),
+}
+
+
+def runScript(path, constants=None):
+    """
+    Run a script as __main__, with the shared library bundled in the same
+    way sim/build.py does for the brain. constants maps module-level
+    NAME = value assignments to the values to use instead.
+    """
+    with open(path) as file:
+        source = build.bundle(file.read())
+    for name, value in (constants or {}).items():
+        source, count = re.subn(r"^%s = [^#\n]*" % name, "%s = %r " % (name, value),
+                                source, flags=re.MULTILINE)
+        if not count:
+            raise KeyError("%s is not a constant in %s" % (name, path))
+
+    # Tracebacks show lines from the bundled source
+    filename = "%s (bundled)" % path
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    exec(compile(source, filename, "exec"), {"__name__": "__main__", "__file__": path})
+
+
+def poseError(result):
+    """
+    Distance in inches and heading error in degrees between where the
+    script left the robot and its TARGETS entry, or None if it has none.
+    """
+    name = os.path.basename(os.path.dirname(os.path.dirname(os.path.abspath(result["script"]))))
+    if name not in TARGETS:
+        return None
+    x, y, heading = TARGETS[name]
+    distance = math.hypot(result["x"] - x, result["y"] - y)
+    return distance, abs(result["heading"] - heading)
+
+
+def runMission(path, constants=None, **options):
+    """
+    Run one script until it has finished the requested number of missions
+    and return a result dictionary. Options are passed to vex.Simulation.
+    """
+    sim = vex.startSimulation(**options)
+    wallStart = time.perf_counter()
+    error = None
+    try:
+        runScript(path, constants)
+    except vex.MissionComplete:
+        pass
+    except vex.SimulationTimeout as exc:
+        error = str(exc)
+    finally:
+        sim.shutdown()
+    wall = time.perf_counter() - wallStart
+
+    model = sim.chassis
+    return {
+        "script": path,
+        "missionTimes": sim.missionTimes,
+        "missionTime": sum(sim.missionTimes),
+        "virtualTime": sim.now,
+        "wallTime": wall,
+        "x": model.x,
+        "y": model.y,
+        "heading": -math.degrees(model.theta),
+        "path": model.path,
+        "liftAngle": model.armAngle,
+        "calls": sim.calls,
+        "screen": sim.brain.screen.text() if hasattr(sim, "brain") else "",
+        "files": sim.files,
+        "commands": sim.commands,
+        "error": error,
+    }
+
+
+def report(result, showScreen=False):
+    print(result["script"])
+    if result["error"]:
+        print("  stopped        " + result["error"])
+    for index, seconds in enumerate(result["missionTimes"]):
+        print("  mission %-6d %.2f s" % (index + 1, seconds))
+    print("  virtual time   %.2f s in %.0f ms wall (%d device calls)" % (
+        result["virtualTime"], result["wallTime"] * 1000, result["calls"]))
+    print("  final pose     x=%.1f in  y=%.1f in  heading=%.1f deg" % (
+        result["x"], result["y"], result["heading"]))
+    print("  lift angle     %.1f deg" % result["liftAngle"])
+    error = poseError(result)
+    if error is not None:
+        print("  pose error     %.2f in  %.1f deg" % error)
+    if showScreen and result["screen"]:
+        print("  screen:")
+        for line in result["screen"].splitlines():
+            print("    |" + line)
+
+
+def saveFiles(result, directory):
+    # One folder per assignment, e.g. DIR/A8_TransportChallenge/telemetry.bin
+    name = os.path.basename(os.path.dirname(os.path.dirname(os.path.abspath(result["script"]))))
+    folder = os.path.join(directory, name)
+    os.makedirs(folder, exist_ok=True)
+    for filename, data in result["files"].items():
+        with open(os.path.join(folder, filename), "wb") as file:
+            file.write(data)
+        print("  saved          %s (%d bytes)" % (os.path.join(folder, filename), len(data)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("scripts", nargs="+", help="main.py files to run")
+    parser.add_argument("--missions", type=int, default=1,
+                        help="bump presses to simulate before stopping")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--battery", type=float, default=1.0,
+                        help="starting battery charge from 0 to 1")
+    parser.add_argument("--timeout", type=float, default=120.0,
+                        help="virtual seconds allowed per mission")
+    parser.add_argument("--screen", action="store_true",
+                        help="print the brain screen at the end")
+    parser.add_argument("--sdcard", metavar="DIR",
+                        help="save the files the script wrote to the SD card here")
+    parser.add_argument("--load", metavar="FILE", action="append", default=[],
+                        help="put a file on the SD card before the run, e.g. a calibration")
+    parser.add_argument("--mark", metavar="INCHES", type=float, action="append", default=[],
+                        help="press the bump switch again once the robot has driven this far")
+    args = parser.parse_args()
+
+    files = {}
+    for filename in args.load:
+        with open(filename, "rb") as file:
+            files[os.path.basename(filename)] = file.read()
+
+    for path in args.scripts:
+        result = runMission(path, seed=args.seed, battery=args.battery,
+                            missions=args.missions, timeout=args.timeout,
+                            sdcard=files, marks=args.mark)
+        report(result, args.screen)
+        if args.sdcard:
+            saveFiles(result, args.sdcard)
+
+
+if __name__ == "__main__":
+    main()
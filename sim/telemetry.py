@@ -0,0 +1,123 @@
+# ---------------------------------------------------------------------------- #
+#                                                                              #
+# 	Module:       telemetry.py                                                 #
+# 	Created:      10/18/2026                                                   #
+# 	Description:  Decode the binary telemetry logs the robot writes            #
+#                                                                              #
+# ---------------------------------------------------------------------------- #
+
+# Usage:
+#   python sim/telemetry.py telemetry.bin
+#   python sim/telemetry.py telemetry.bin --csv run.csv
+#
+# The layout matches TelemetryLog in lib/robot.py: an 8 byte header
+# (b"VXTL", format version, record size) and then fixed-size records. Times
+# come out in seconds from the first record, commands in percent.
+
+import argparse
+import csv
+import struct
+
+try:
+    import numpy
+except ImportError:     # NumPy is optional; decode() falls back to lists
+    numpy = None
+
+MAGIC = b"VXTL"
+VERSION = 1
+HEADER_FORMAT = "<4sHH"
+RECORD_FORMAT = "<Iffhhff"  # LOG_FORMAT in lib/robot.py; checked by test_telemetry.py
+FIELDS = ("time", "right", "left", "rightCommand", "leftCommand", "rotation", "lift")
+
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+
+def readHeader(data):
+    if len(data) < HEADER_SIZE:
+        raise ValueError("telemetry log is too short for its header")
+    magic, version, size = struct.unpack_from(HEADER_FORMAT, data)
+    if magic != MAGIC:
+        raise ValueError("not a telemetry log (magic %r)" % magic)
+    if version != VERSION or size != RECORD_SIZE:
+        raise ValueError("unsupported telemetry log version %d, record size %d" % (version, size))
+
+
+def decode(data, arrays=None):
+    """
+    Decode a log (bytes or a file path) into a dict of columns keyed by
+    FIELDS. Columns are NumPy arrays when NumPy is installed (or arrays is
+    True) and lists otherwise. A torn record at the end is ignored.
+    """
+    if isinstance(data, str):
+        with open(data, "rb") as file:
+            data = file.read()
+    readHeader(data)
+    count = (len(data) - HEADER_SIZE) // RECORD_SIZE
+    if arrays is None:
+        arrays = numpy is not None
+    if arrays and numpy is None:
+        raise ImportError("NumPy is not installed")
+
+    if arrays:
+        dtype = numpy.dtype([("time", "<u4"), ("right", "<f4"), ("left", "<f4"),
+                             ("rightCommand", "<i2"), ("leftCommand", "<i2"),
+                             ("rotation", "<f4"), ("lift", "<f4")])
+        records = numpy.frombuffer(data, dtype, count, HEADER_SIZE)
+        columns = {name: records[name].astype(float) for name in FIELDS}
+        columns["time"] = numpy.array(timeline(records["time"].tolist()))
+        columns["rightCommand"] /= 100
+        columns["leftCommand"] /= 100
+        return columns
+
+    rows = [struct.unpack_from(RECORD_FORMAT, data, HEADER_SIZE + k * RECORD_SIZE)
+            for k in range(count)]
+    columns = {name: [row[index] for row in rows] for index, name in enumerate(FIELDS)}
+    columns["time"] = timeline(columns["time"])
+    columns["rightCommand"] = [value / 100 for value in columns["rightCommand"]]
+    columns["leftCommand"] = [value / 100 for value in columns["leftCommand"]]
+    return columns
+
+
+def timeline(stamps):
+    # Microsecond stamps (which wrap at 32 bits) -> seconds from the first record
+    times = []
+    offset = 0
+    previous = None
+    for stamp in stamps:
+        if previous is not None and stamp < previous:
+            offset += 1 << 32
+        previous = stamp
+        times.append(stamp + offset)
+    start = times[0] if times else 0
+    return [(stamp - start) / 1000000 for stamp in times]
+
+
+def writeCsv(columns, path):
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(FIELDS)
+        for row in zip(*(columns[name] for name in FIELDS)):
+            writer.writerow(["%.6g" % value for value in row])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("log", help="telemetry.bin copied off the SD card")
+    parser.add_argument("--csv", help="write the records to this CSV file")
+    args = parser.parse_args()
+
+    columns = decode(args.log, arrays=False)
+    times = columns["time"]
+    print("%s: %d records over %.2f s" % (args.log, len(times), times[-1] if times else 0))
+    if len(times) > 1:
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        print("  record spacing  avg %.1f ms, max %.1f ms" % (
+            1000 * sum(gaps) / len(gaps), 1000 * max(gaps)))
+    if args.csv:
+        writeCsv(columns, args.csv)
+        print("  wrote %s" % args.csv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# ---------------------------------------------------------------------------- #
+#                                                                              #
+# 	Module:       test_build.py                                                #
+# 	Created:      10/18/2026                                                   #
+# 	Description:  Tests for the library bundling in build.py                   #
+#                                                                              #
+# ---------------------------------------------------------------------------- #
+
+# Usage:
+#   python -m pytest sim
+#   python -m unittest discover sim
+#
+# build.py decides what code reaches the robot, so these check the tree
+# shaking on small made-up libraries, and that every project's build of the
+# real library compiles and only calls math functions the brain has.
+
+import ast
+import glob
+import os
+import sys
+import tempfile
+import unittest
+
+SIM_DIR = os.path.dirname(os.path.abspath(__file__))
+if SIM_DIR not in sys.path:
+    sys.path.insert(0, SIM_DIR)
+
+import build  # noqa: E402
+
+# Functions in V5 MicroPython's math module (no hypot, dist, isclose, ...)
+MICROPYTHON_MATH = {
+    "pi", "e", "inf", "nan", "sqrt", "pow", "exp", "log", "cos", "sin", "tan",
+    "acos", "asin", "atan", "atan2", "ceil", "floor", "trunc", "fabs", "fmod",
+    "modf", "frexp", "ldexp", "copysign", "isfinite", "isinf", "isnan",
+    "degrees", "radians",
+}
+
+
+def names(source):
+    # Top-level names a module defines
+    defined = set()
+    for node in ast.parse(source).body:
+        defined |= build.definedNames(node)
+    return defined
+
+
+class ShakeTest(unittest.TestCase):
+    def test_keeps_only_what_the_roots_reach(self):
+        library = "A = 1\nB = 2\n\ndef f():\n    return A\n\ndef g():\n    return B\n"
+        self.assertEqual(names(build.shake(library, {"f"})), {"f", "A"})
+
+    def test_follows_decorators(self):
+        library = ("def profiled(function):\n    return function\n\n"
+                   "@profiled\ndef move():\n    pass\n")
+        self.assertEqual(names(build.shake(library, {"move"})), {"profiled", "move"})
+
+    def test_follows_global_names(self):
+        # counter is only ever assigned inside the function
+        library = "counter = 0\n\ndef bump():\n    global counter\n    counter = 1\n"
+        self.assertEqual(names(build.shake(library, {"bump"})), {"bump", "counter"})
+
+    def test_keeps_statements_that_define_nothing(self):
+        library = "def f():\n    pass\n\nprint('configured')\n"
+        self.assertIn("print('configured')", build.shake(library, set()))
+
+    def test_keeps_comments_with_their_statement(self):
+        library = "# The answer\nA = 42\n\n# Unused\nB = 1\n"
+        shaken = build.shake(library, {"A"})
+        self.assertIn("# The answer", shaken)
+        self.assertNotIn("# Unused", shaken)
+
+    def test_drops_replaced_names(self):
+        library = "def f():\n    return 1\n\ndef g():\n    return f()\n"
+        self.assertEqual(names(build.shake(library, {"g"}, replaced={"f"})), {"g"})
+
+    def test_drops_skipped_imports(self):
+        library = "import struct\nimport math\n\nX = math.pi + struct.calcsize('<I')\n"
+        shaken = build.shake(library, {"X"}, skip={"import struct"})
+        self.assertNotIn("import struct", shaken)
+        self.assertIn("import math", shaken)
+
+
+class BundleTest(unittest.TestCase):
+    def bundle(self, library, script):
+        with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as file:
+            file.write(library)
+        try:
+            return build.bundle(script, library=file.name)
+        finally:
+            os.remove(file.name)
+
+    def test_script_without_the_library_is_unchanged(self):
+        script = "print('hello')\n"
+        self.assertEqual(self.bundle("A = 1\n", script), script)
+
+    def test_replaces_the_import_line(self):
+        bundled = self.bundle("def f():\n    return 1\n", "from robot import *\nf()\n")
+        self.assertNotIn("from robot import", bundled)
+        self.assertEqual(names(bundled), {"f"})
+
+    def test_script_overrides_a_library_name(self):
+        # The script's own spin wins; what the library's spin needed goes too,
+        # but what the script's version needs stays
+        library = ("GAIN = 2\nLIMIT = 100\n\ndef spin(v):\n    return v * GAIN\n\n"
+                   "def drive():\n    return spin(LIMIT)\n")
+        script = ("from robot import *\n\ndef spin(v):\n    return min(v, LIMIT)\n\n"
+                  "drive()\n")
+        bundled = self.bundle(library, script)
+        self.assertEqual(names(bundled), {"LIMIT", "drive", "spin"})
+        self.assertEqual(bundled.count("def spin"), 1)
+        namespace = {}
+        exec(compile(bundled, "main.py", "exec"), namespace)
+        self.assertEqual(namespace["drive"](), 100)
+
+    def test_script_import_is_not_repeated(self):
+        library = "import struct\n\nSIZE = struct.calcsize('<I')\n"
+        bundled = self.bundle(library, "import struct\nfrom robot import *\nprint(SIZE)\n")
+        self.assertEqual(bundled.count("import struct"), 1)
+        self.assertLess(bundled.index("import struct"), bundled.index("SIZE ="))
+
+    def test_library_lands_where_the_import_was(self):
+        bundled = self.bundle("A = 1\n", "X = 0\nfrom robot import *\nprint(A)\n")
+        self.assertLess(bundled.index("X = 0"), bundled.index("A = 1"))
+        self.assertLess(bundled.index("A = 1"), bundled.index("print(A)"))
+
+
+class ProjectBuildTest(unittest.TestCase):
+    def scripts(self):
+        return sorted(glob.glob(os.path.join(build.ROOT, "*", "src", "main.py")))
+
+    def test_every_project_builds(self):
+        for path in self.scripts():
+            with self.subTest(path=path), open(path) as file:
+                bundled = build.strip(build.bundle(file.read()))
+                compile(bundled, path, "exec")
+                self.assertNotIn("from robot import", bundled)
+
+    def test_math_calls_exist_on_the_brain(self):
+        sources = [build.LIBRARY] + self.scripts()
+        for path in sources:
+            with open(path) as file:
+                tree = ast.parse(file.read())
+            for node in ast.walk(tree):
+                if (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name)
+                        and node.value.id == "math"):
+                    with self.subTest(path=path, function=node.attr):
+                        self.assertIn(node.attr, MICROPYTHON_MATH)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+# ---------------------------------------------------------------------------- #
+#                                                                              #
+# 	Module:       test_telemetry.py                                            #
+# 	Created:      10/18/2026                                                   #
+# 	Description:  Tests that telemetry.py decodes what lib/robot.py logs       #
+#                                                                              #
+# ---------------------------------------------------------------------------- #
+
+# Usage:
+#   python -m pytest sim
+#   python -m unittest discover sim
+#
+# The log's binary layout is written out twice, as LOG_FORMAT in
+# lib/robot.py and as RECORD_FORMAT in telemetry.py. These run a short
+# mission in the simulator that also saves the values it logged as text, and
+# check that decoding telemetry.bin gives them back.
+
+import os
+import struct
+import sys
+import tempfile
+import unittest
+
+SIM_DIR = os.path.dirname(os.path.abspath(__file__))
+if SIM_DIR not in sys.path:
+    sys.path.insert(0, SIM_DIR)
+
+import telemetry  # noqa: E402
+from run import runMission  # noqa: E402
+
+# Columns of each line MISSION saves, in the order TelemetryLog packs them
+LOGGED = ("time", "right", "left", "rightCommand", "leftCommand", "rotation", "lift")
+
+# Drives and lifts, saving each logged record's values as a line of text
+MISSION = '''
+from vex import *
+from robot import *
+
+logged = []
+logRecord = telemetryLog.record
+
+def record(snapshot):
+    head = telemetryLog.head
+    logRecord(snapshot)
+    if telemetryLog.head > head:
+        logged.append("%d %r %r %d %d %r %r" % (
+            snapshot.time & 0xFFFFFFFF, snapshot.right + snapshot.rightZero,
+            snapshot.left + snapshot.leftZero, int(telemetryLog.rightCommand * 100),
+            int(telemetryLog.leftCommand * 100), snapshot.rotation, snapshot.lift))
+
+telemetryLog.record = record
+
+calibrateInertial()
+bump()
+resetPose()
+telemetryLog.begin()
+gyroDriveStraight(24, 40)
+liftArm(40, 30)
+settle()
+brain.sdcard.savefile("logged.txt", bytearray("\\n".join(logged).encode()))
+bump()
+'''
+
+
+class TelemetryRoundTripTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as file:
+            file.write(MISSION)
+        try:
+            result = runMission(file.name)
+        finally:
+            os.remove(file.name)
+        if result["error"]:
+            raise AssertionError(result["error"])
+        cls.data = bytes(result["files"]["telemetry.bin"])
+        cls.logged = [line.split() for line in
+                      bytes(result["files"]["logged.txt"]).decode().splitlines()]
+
+    def test_header(self):
+        magic, version, size = struct.unpack_from(telemetry.HEADER_FORMAT, self.data)
+        self.assertEqual((magic, version, size), (telemetry.MAGIC, telemetry.VERSION,
+                                                  telemetry.RECORD_SIZE))
+        telemetry.readHeader(self.data)
+
+    def test_record_count(self):
+        self.assertGreater(len(self.logged), 100)
+        self.assertEqual(len(self.data), telemetry.HEADER_SIZE
+                         + len(self.logged) * telemetry.RECORD_SIZE)
+        self.assertEqual(len(telemetry.decode(self.data, arrays=False)["time"]), len(self.logged))
+
+    def decodings(self):
+        # Both decoders when NumPy is installed
+        yield "lists", telemetry.decode(self.data, arrays=False)
+        if telemetry.numpy is not None:
+            yield "arrays", telemetry.decode(self.data, arrays=True)
+
+    def test_columns_match_the_logged_values(self):
+        start = int(self.logged[0][0])
+        for decoder, columns in self.decodings():
+            self.assertEqual(set(columns), set(LOGGED))
+            for index, name in enumerate(LOGGED):
+                with self.subTest(decoder=decoder, column=name):
+                    self.checkColumn(columns[name], index, name, start)
+
+    def checkColumn(self, column, index, name, start):
+        for k, row in enumerate(self.logged):
+            value = float(row[index])
+            if name == "time":
+                value = (value - start) / 1000000
+            elif name in ("rightCommand", "leftCommand"):
+                value /= 100
+            # Positions and angles are stored as 32-bit floats
+            self.assertAlmostEqual(column[k], value, delta=1e-6 * max(1, abs(value)))
+
+    def test_mission_moved_every_column(self):
+        # Constant columns would pass the comparison however they were packed
+        columns = telemetry.decode(self.data, arrays=False)
+        for name in LOGGED:
+            with self.subTest(column=name):
+                self.assertGreater(max(columns[name]) - min(columns[name]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
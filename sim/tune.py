@@ -0,0 +1,229 @@
+# ---------------------------------------------------------------------------- #
+#                                                                              #
+# 	Module:       tune.py                                                      #
+# 	Created:      10/18/2026                                                   #
+# 	Description:  Search the assignment constants against the simulator       #
+#                                                                              #
+# ---------------------------------------------------------------------------- #
+
+# Usage:
+#   python sim/tune.py --search random --trials 64
+#   python sim/tune.py --search grid --params HEADING_KP,HEADING_KI --steps 5
+#   python sim/tune.py A8_TransportChallenge/src/main.py --search bayes
+#
+# Every parameter set runs each script through one mission, in a process
+# pool. A set is feasible when every script ends within --max-distance inches
+# and --max-heading degrees of its TARGETS pose; feasible sets are ranked by
+# total mission time, ahead of all infeasible ones. The ranked table goes to
+# --output as CSV and the best rows are printed.
+
+import argparse
+import concurrent.futures
+import contextlib
+import csv
+import io
+import math
+import os
+import random
+import sys
+
+SIM_DIR = os.path.dirname(os.path.abspath(__file__))
+if SIM_DIR not in sys.path:
+    sys.path.insert(0, SIM_DIR)
+
+from run import TARGETS, poseError, runMission  # noqa: E402
+
+ROOT = os.path.dirname(SIM_DIR)
+DEFAULT_SCRIPTS = [os.path.join(ROOT, name, "src", "main.py") for name in
+                   ("A6_SentrySimulation", "A7_RotationSensor", "A8_TransportChallenge")]
+
+# Search ranges of the shared drivetrain constants: name -> (low, high)
+PARAMETERS = {
+    "HEADING_KP": (0.5, 4.0),
+    "HEADING_KI": (0.0, 4.0),
+    "HEADING_KD": (0.0, 0.3),
+    "TURN_DPS": (3.5, 5.5),
+    "PROFILE_KP": (1.0, 10.0),
+    "DRIVE_ACCEL": (2000.0, 8000.0),
+    "GYRO_TURN_ACCEL": (500.0, 3000.0),
+}
+
+PENALTY = 1000.0        # Added to the score of an infeasible set
+GOOD_FRACTION = 0.25    # Share of trials the Bayesian search models as good
+BANDWIDTH = 0.15        # Kernel width as a fraction of each range
+CANDIDATES = 64         # Points scored per Bayesian proposal
+
+
+def evaluate(job):
+    """
+    Run every script with one parameter set and return a table row.
+    Runs in a worker process.
+    """
+    scripts, constants, options, maxDistance, maxHeading = job
+    row = {"constants": constants, "missionTime": 0.0, "distance": 0.0,
+           "heading": 0.0, "error": ""}
+    for path in scripts:
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = runMission(path, constants, **options)
+        except Exception as exc:
+            result = {"error": "%s: %s" % (type(exc).__name__, exc)}
+        if result["error"] or not result["missionTimes"]:
+            row["error"] = row["error"] or result["error"] or "mission did not finish"
+            continue
+        row["missionTime"] += result["missionTime"]
+        error = poseError(result)
+        if error is not None:
+            row["distance"] = max(row["distance"], error[0])
+            row["heading"] = max(row["heading"], error[1])
+
+    row["feasible"] = (not row["error"] and row["distance"] <= maxDistance
+                       and row["heading"] <= maxHeading)
+    row["score"] = row["missionTime"]
+    if not row["feasible"]:
+        excess = max(0.0, row["distance"] - maxDistance) + max(0.0, row["heading"] - maxHeading)
+        row["score"] += PENALTY * (1 + excess + (1 if row["error"] else 0))
+    return row
+
+
+def rounded(value):
+    return float("%.4g" % value)
+
+
+def gridPoints(names, steps):
+    points = [{}]
+    for name in names:
+        low, high = PARAMETERS[name]
+        values = [rounded(low + (high - low) * k / max(1, steps - 1)) for k in range(steps)]
+        points = [dict(point, **{name: value}) for point in points for value in values]
+    return points
+
+
+def randomPoint(names, rng):
+    return {name: rounded(rng.uniform(*PARAMETERS[name])) for name in names}
+
+
+def density(point, samples, names):
+    # Parzen estimate: a Gaussian kernel on each sample, in unit-range space
+    total = 0.0
+    for sample in samples:
+        distance = 0.0
+        for name in names:
+            low, high = PARAMETERS[name]
+            distance += ((point[name] - sample[name]) / ((high - low) * BANDWIDTH)) ** 2
+        total += math.exp(-distance / 2)
+    return total / len(samples) + 1e-12
+
+
+def proposePoints(names, rows, count, rng):
+    """
+    Tree-structured Parzen step: model the best trials and the rest as two
+    densities and propose the candidates most likely to be good.
+    """
+    ranked = sorted(rows, key=lambda row: row["score"])
+    split = max(1, int(len(ranked) * GOOD_FRACTION))
+    good = [row["constants"] for row in ranked[:split]]
+    bad = [row["constants"] for row in ranked[split:]] or good
+
+    candidates = []
+    for _ in range(CANDIDATES):
+        centre = rng.choice(good)
+        point = {}
+        for name in names:
+            low, high = PARAMETERS[name]
+            value = rng.gauss(centre[name], (high - low) * BANDWIDTH)
+            point[name] = rounded(min(high, max(low, value)))
+        candidates.append(point)
+    candidates.sort(key=lambda point: density(point, good, names) / density(point, bad, names),
+                    reverse=True)
+    return candidates[:count]
+
+
+def search(args, names, pool):
+    options = {"seed": args.seed, "timeout": args.timeout}
+    scripts = args.scripts or DEFAULT_SCRIPTS
+
+    def runBatch(points):
+        jobs = [(scripts, point, options, args.max_distance, args.max_heading) for point in points]
+        batch = list(pool.map(evaluate, jobs))
+        print("  %d trials, best so far %.2f s" % (
+            len(rows) + len(batch), min(row["score"] for row in rows + batch)))
+        return batch
+
+    rng = random.Random(args.seed)
+    rows = []
+    if args.search == "grid":
+        rows += runBatch(gridPoints(names, args.steps))
+    elif args.search == "random":
+        rows += runBatch([randomPoint(names, rng) for _ in range(args.trials)])
+    else:
+        batchSize = max(1, args.workers)
+        start = min(args.trials, max(batchSize, 2 * len(names)))
+        rows += runBatch([randomPoint(names, rng) for _ in range(start)])
+        while len(rows) < args.trials:
+            count = min(batchSize, args.trials - len(rows))
+            rows += runBatch(proposePoints(names, rows, count, rng))
+    return sorted(rows, key=lambda row: row["score"])
+
+
+def writeTable(rows, names, path):
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["rank", "score", "missionTime", "distance", "heading",
+                         "feasible", "error"] + names)
+        for rank, row in enumerate(rows, 1):
+            writer.writerow([rank, "%.3f" % row["score"], "%.3f" % row["missionTime"],
+                             "%.3f" % row["distance"], "%.2f" % row["heading"],
+                             row["feasible"], row["error"]] + [row["constants"][n] for n in names])
+
+
+def printTable(rows, names, count):
+    print("%4s %9s %7s %6s  %s" % ("rank", "mission", "dist", "head", "  ".join(names)))
+    for rank, row in enumerate(rows[:count], 1):
+        flag = "" if row["feasible"] else "  (infeasible%s)" % (
+            ": " + row["error"] if row["error"] else "")
+        values = "  ".join("%*g" % (len(n), row["constants"][n]) for n in names)
+        print("%4d %7.2f s %7.2f %6.1f  %s%s" % (
+            rank, row["missionTime"], row["distance"], row["heading"], values, flag))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("scripts", nargs="*",
+                        help="main.py files to tune against (default A6, A7 and A8)")
+    parser.add_argument("--search", choices=("grid", "random", "bayes"), default="bayes")
+    parser.add_argument("--params", default=",".join(PARAMETERS),
+                        help="comma-separated constants to search")
+    parser.add_argument("--trials", type=int, default=48,
+                        help="parameter sets to try (random and bayes)")
+    parser.add_argument("--steps", type=int, default=3,
+                        help="values per parameter (grid)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60.0,
+                        help="virtual seconds allowed per mission")
+    parser.add_argument("--max-distance", type=float, default=1.0,
+                        help="inches of final position error allowed")
+    parser.add_argument("--max-heading", type=float, default=2.0,
+                        help="degrees of final heading error allowed")
+    parser.add_argument("--output", default="tune_results.csv")
+    parser.add_argument("--top", type=int, default=10, help="rows to print")
+    args = parser.parse_args()
+
+    names = [name for name in args.params.split(",") if name]
+    for name in names:
+        if name not in PARAMETERS:
+            parser.error("unknown parameter %s (choose from %s)" % (name, ", ".join(PARAMETERS)))
+    for path in args.scripts:
+        if os.path.basename(os.path.dirname(os.path.dirname(os.path.abspath(path)))) not in TARGETS:
+            print("warning: %s has no target pose, so only its mission time counts" % path)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.workers) as pool:
+        rows = search(args, names, pool)
+    writeTable(rows, names, args.output)
+    printTable(rows, names, args.top)
+    print("%d parameter sets ranked in %s" % (len(rows), args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,918 @@
+# ---------------------------------------------------------------------------- #
+#                                                                              #
+# 	Module:       vex.py                                                       #
+# 	Created:      10/18/2026                                                   #
+# 	Description:  Headless stand-in for the V5 vex module                      #
+#                                                                              #
+# ---------------------------------------------------------------------------- #
+
+# The assignment scripts do "from vex import *" and run main() at import time.
+# With this directory first on sys.path they get the classes below instead
+# of the V5 firmware ones. Every device call charges a small amount of virtual
+# time and wait() jumps the clock forward, so a whole mission runs as fast as
+# the physics can be stepped. See run.py for the command-line runner.
+#
+# Threads are cooperative, like on the brain: only one runs at a time and it
+# keeps the CPU until it calls wait(), which hands over to whichever thread
+# is due to wake first.
+
+import heapq
+import math
+import threading
+
+import chassis
+
+__all__ = [
+    "math", "Brain", "Motor", "Rotation", "Inertial", "Bumper", "Ports",
+    "GearSetting", "Thread", "wait", "sleep",
+    "TimeUnits", "RotationUnits", "VelocityUnits", "VoltageUnits",
+    "CurrentUnits", "PercentUnits", "DirectionType", "BrakeType", "AxisType",
+    "OrientationType", "Color", "FontType",
+    "SECONDS", "SEC", "MSEC", "DEGREES", "TURNS", "PERCENT", "RPM", "DPS",
+    "VOLT", "MV", "AMP", "FORWARD", "REVERSE", "BRAKE", "COAST", "HOLD",
+    "XAXIS", "YAXIS", "ZAXIS", "ROLL", "PITCH", "YAW",
+]
+
+# Physics step and how often each kind of device reports a new reading
+PHYSICS_STEP = 0.001
+MOTOR_PERIOD = 0.005
+INERTIAL_PERIOD = 0.01
+
+# Virtual seconds charged per API call. Screen writes go over a slow path on
+# the brain, device reads and writes are cheap but not free.
+CALL_COST = {
+    "read": 20e-6,
+    "command": 50e-6,
+    "timer": 5e-6,
+    "cursor": 100e-6,
+    "print": 500e-6,
+    "sdcard": 2e-3,
+}
+SDCARD_BYTE_COST = 1e-6     # Extra virtual seconds per byte written to the SD card
+
+# When replaying, the trace is lined up move by move: the script's first
+# drive command of a move maps to one control tick before the trace's record
+# of it, because the robot logs a command on the tick after sending it.
+REPLAY_LAG = 0.01
+# A stop and a spin closer together than one control tick never show up in
+# the log as a stop, e.g. a turn that hands straight over to a blended path,
+# so the replay carries on with the same move instead of starting the next.
+REPLAY_JOIN = 0.01
+
+# Default wiring, matching the robot configuration block in lib/robot.py
+DEFAULT_WIRING = {"right": 0, "left": 1, "lift": 2, "inertial": 4,
+                  "liftRotation": 5, "bumper": "a"}
+
+
+# A mission is over once the script has polled the bump switch with the robot
+# at rest for this long. Polls further apart than POLL_GAP don't count as
+# waiting on the switch.
+IDLE_TIME = 1.0
+POLL_GAP = 0.1
+
+
+class MissionComplete(Exception):
+    """Raised when the script goes back to waiting on the bump switch."""
+
+
+class SimulationTimeout(Exception):
+    """Raised when a mission runs past the virtual time limit."""
+
+
+class ThreadStop(BaseException):
+    """Unwinds a simulated thread that was stopped or outlived its simulation."""
+
+
+class Task:
+    """One thread of control in the simulation."""
+
+    def __init__(self):
+        self.resume = threading.Event()
+        self.ticket = 0         # Bumped to cancel a queued wake-up
+        self.stopped = False
+        self.done = False
+
+
+# ---------------------------------------------------------------------------- #
+#   Units and enums                                                            #
+# ---------------------------------------------------------------------------- #
+
+class TimeUnits:
+    SECONDS = "SECONDS"
+    SEC = SECONDS
+    MSEC = "MSEC"
+
+
+class RotationUnits:
+    DEG = "DEGREES"
+    REV = "TURNS"
+    RAW = "RAW"
+
+
+class VelocityUnits:
+    PERCENT = "PERCENT"
+    RPM = "RPM"
+    DPS = "DPS"
+
+
+class VoltageUnits:
+    VOLT = "VOLT"
+    MV = "MV"
+
+
+class CurrentUnits:
+    AMP = "AMP"
+
+
+class PercentUnits:
+    PERCENT = VelocityUnits.PERCENT
+
+
+class DirectionType:
+    FORWARD = "FORWARD"
+    REVERSE = "REVERSE"
+
+
+class BrakeType:
+    COAST = "coast"
+    BRAKE = "brake"
+    HOLD = "hold"
+
+
+class AxisType:
+    XAXIS = "XAXIS"
+    YAXIS = "YAXIS"
+    ZAXIS = "ZAXIS"
+
+
+class OrientationType:
+    ROLL = "ROLL"
+    PITCH = "PITCH"
+    YAW = "YAW"
+
+
+class Color:
+    BLACK = "BLACK"
+    WHITE = "WHITE"
+    RED = "RED"
+    GREEN = "GREEN"
+    BLUE = "BLUE"
+    YELLOW = "YELLOW"
+    ORANGE = "ORANGE"
+    PURPLE = "PURPLE"
+
+
+class FontType:
+    MONO20 = "MONO20"
+    MONO30 = "MONO30"
+    PROP20 = "PROP20"
+
+
+SECONDS = TimeUnits.SECONDS
+SEC = TimeUnits.SEC
+MSEC = TimeUnits.MSEC
+DEGREES = RotationUnits.DEG
+TURNS = RotationUnits.REV
+PERCENT = VelocityUnits.PERCENT
+RPM = VelocityUnits.RPM
+DPS = VelocityUnits.DPS
+VOLT = VoltageUnits.VOLT
+MV = VoltageUnits.MV
+AMP = CurrentUnits.AMP
+FORWARD = DirectionType.FORWARD
+REVERSE = DirectionType.REVERSE
+COAST = BrakeType.COAST
+BRAKE = BrakeType.BRAKE
+HOLD = BrakeType.HOLD
+XAXIS = AxisType.XAXIS
+YAXIS = AxisType.YAXIS
+ZAXIS = AxisType.ZAXIS
+ROLL = OrientationType.ROLL
+PITCH = OrientationType.PITCH
+YAW = OrientationType.YAW
+
+
+class Ports:
+    pass
+
+
+for _number in range(1, 22):
+    setattr(Ports, "PORT%d" % _number, _number - 1)
+
+
+class GearSetting:
+    RATIO_36_1 = "36_1"
+    RATIO_18_1 = "18_1"
+    RATIO_6_1 = "6_1"
+
+
+def toSeconds(value, units):
+    return value / 1000 if units == MSEC else value
+
+
+def toDegrees(value, units):
+    return value * 360 if units == TURNS else value
+
+
+def fromDegrees(value, units):
+    return value / 360 if units == TURNS else value
+
+
+# ---------------------------------------------------------------------------- #
+#   Virtual clock                                                              #
+# ---------------------------------------------------------------------------- #
+
+class Simulation:
+    """
+    Owns the virtual clock, the chassis physics and the bump-switch script.
+    The bump switch reads pressed once, on the first poll, which starts a
+    mission. The mission ends when the script has been polling the switch
+    with the robot at rest for IDLE_TIME, i.e. it is back in bump().
+    During a mission it also reads pressed once as the robot passes each
+    of marks, in inches driven since the mission started, like an operator
+    pressing it as the robot crosses a line on the floor.
+    """
+
+    def __init__(self, seed=0, battery=1.0, missions=1, timeout=120.0,
+                 wiring=None, costs=None, sdcard=None, trace=None, monitors=None,
+                 marks=None):
+        self.chassis = chassis.Chassis(seed=seed, battery=battery)
+        self.wiring = dict(DEFAULT_WIRING, **(wiring or {}))
+        self.costs = dict(CALL_COST, **(costs or {}))
+        self.missions = missions
+        self.timeout = timeout
+
+        self.now = 0.0
+        self.nextStep = PHYSICS_STEP
+        self.devices = []
+        self.calls = 0
+        self.monitors = list(monitors or [])  # Called with the simulation every physics step
+        self.files = dict(sdcard or {})     # SD card contents: name -> bytes
+
+        # Replay: sensors read back a recorded trace (anything with at(seconds)
+        # and moveStart(n) methods, see replay.py) and motor commands are captured
+        self.trace = trace
+        self.traceStart = None      # Virtual time at trace time 0
+        self.traceMove = -1         # Trace move the script is on
+        self.driveStopped = True
+        self.stoppedAt = None       # Virtual time of the last drive stop
+        self.commands = []          # (trace seconds, role, method, arguments)
+
+        self.pressed = 0            # Bump presses handed out so far
+        self.lastPress = 0.0
+        self.lastPoll = None
+        self.idleSince = None
+        self.missionStart = None
+        self.missionTimes = []
+        self.marks = sorted(marks or [])
+        self.marksPassed = 0        # Marks pressed for so far this mission
+        self.pathStart = 0.0        # chassis.path when the mission started
+
+        self.main = Task()
+        self.current = self.main
+        self.tasks = [self.main]
+        self.queue = []             # (wake time, order, ticket, task) heap
+        self.order = 0
+        self.failure = None         # Exception from a thread, re-raised in main
+        self.closed = False
+
+    def register(self, device):
+        self.devices.append(device)
+
+    def charge(self, kind):
+        self.calls += 1
+        self.advance(self.costs[kind])
+
+    def advance(self, seconds):
+        end = self.now + seconds
+        while self.nextStep <= end:
+            self.now = self.nextStep
+            self.chassis.step(PHYSICS_STEP)
+            for monitor in self.monitors:
+                monitor(self)
+            for device in self.devices:
+                device.sample(self.now)
+            self.nextStep += PHYSICS_STEP
+        self.now = end
+
+        if self.now - self.lastPress > self.timeout:
+            raise SimulationTimeout("no mission finished within %.0f s" % self.timeout)
+
+    def schedule(self, task, when):
+        heapq.heappush(self.queue, (when, self.order, task.ticket, task))
+        self.order += 1
+
+    def popNext(self):
+        # Take the task that wakes first and run the clock up to its wake time
+        while True:
+            when, _, ticket, task = heapq.heappop(self.queue)
+            if ticket == task.ticket:
+                break
+        if when > self.now:
+            self.advance(when - self.now)
+        return task
+
+    def sleep(self, seconds):
+        if not self.queue:
+            self.advance(seconds)
+            return
+
+        me = self.current
+        self.schedule(me, self.now + seconds)
+        task = self.popNext()
+        if task is not me:
+            self.current = task
+            task.resume.set()
+            me.resume.wait()
+            me.resume.clear()
+        self.resumed(me)
+
+    def resumed(self, task):
+        if self.closed or task.stopped:
+            raise ThreadStop()
+        if task is self.main and self.failure is not None:
+            failure, self.failure = self.failure, None
+            raise failure
+
+    def finish(self, task):
+        # A thread ended: hand over without queuing it again. Errors go
+        # straight back to the main thread.
+        task.done = True
+        if self.closed:
+            return
+        if self.failure is None:
+            try:
+                nextTask = self.popNext()
+            except BaseException as exc:
+                self.failure = exc
+        if self.failure is not None:
+            self.main.ticket += 1
+            nextTask = self.main
+        self.current = nextTask
+        nextTask.resume.set()
+
+    def shutdown(self):
+        # Unwind every thread still blocked in wait()
+        self.closed = True
+        for task in self.tasks:
+            task.resume.set()
+
+    def atRest(self):
+        model = self.chassis
+        return all(motor.mode == "stop" and abs(motor.speed) < 1
+                   for motor in (model.right, model.left, model.lift))
+
+    def bumperPoll(self):
+        polledRecently = self.lastPoll is not None and self.now - self.lastPoll <= POLL_GAP
+        self.lastPoll = self.now
+        if self.missionStart is not None:
+            if (self.marksPassed < len(self.marks)
+                    and self.chassis.path - self.pathStart >= self.marks[self.marksPassed]):
+                self.marksPassed += 1
+                return True
+            if not (self.atRest() and polledRecently):
+                self.idleSince = None
+                return False
+            if self.idleSince is None:
+                self.idleSince = self.now
+            if self.now - self.idleSince < IDLE_TIME:
+                return False
+
+            self.missionTimes.append(self.idleSince - self.missionStart)
+            self.missionStart = None
+            self.idleSince = None
+            if len(self.missionTimes) >= self.missions:
+                raise MissionComplete()
+        self.pressed += 1
+        self.lastPress = self.now
+        self.missionStart = self.now
+        self.marksPassed = 0
+        self.pathStart = self.chassis.path
+        return True
+
+    def traceTime(self):
+        if self.traceStart is None:
+            return -REPLAY_LAG
+        return self.now - self.traceStart - REPLAY_LAG
+
+    def traced(self):
+        # Recorded sensor values for now. While the drive is stopped the trace
+        # holds just before its next move until the script starts that move.
+        seconds = self.traceTime()
+        if self.driveStopped:
+            nextStart = self.trace.moveStart(self.traceMove + 1)
+            if nextStart is not None and seconds > nextStart - REPLAY_LAG:
+                return self.trace.at(nextStart - REPLAY_LAG, still=True)
+        return self.trace.at(seconds)
+
+    def capture(self, model, method, *args):
+        if self.trace is None:
+            return
+        role = {id(self.chassis.right): "right", id(self.chassis.left): "left",
+                id(self.chassis.lift): "lift"}.get(id(model), "other")
+        if role in ("right", "left") and self.missionStart is not None:
+            if method == "stop":
+                if not self.driveStopped:
+                    self.stoppedAt = self.now
+                self.driveStopped = True
+            elif self.driveStopped and self.stoppedAt is not None and self.now - self.stoppedAt < REPLAY_JOIN:
+                self.driveStopped = False   # The log never saw the stop
+            elif self.driveStopped:
+                # A new move: line it up with the trace's next one
+                self.driveStopped = False
+                start = self.trace.moveStart(self.traceMove + 1)
+                if start is not None:
+                    self.traceMove += 1
+                    self.traceStart = self.now - start
+        if self.traceStart is not None:
+            self.commands.append((self.traceTime(), role, method, args))
+
+    def motorModel(self, port):
+        roles = {"right": self.chassis.right, "left": self.chassis.left,
+                 "lift": self.chassis.lift}
+        for role, model in roles.items():
+            if self.wiring[role] == port:
+                return model
+        return chassis.MotorModel()
+
+
+simulation = Simulation()
+
+
+def startSimulation(**options):
+    """Replace the running simulation, e.g. before running another script."""
+    global simulation
+    simulation = Simulation(**options)
+    return simulation
+
+
+def wait(time, units=MSEC):
+    simulation.sleep(toSeconds(time, units))
+
+
+sleep = wait
+
+
+class Thread:
+    """Starts callback on its own thread once the caller next waits."""
+
+    def __init__(self, callback, args=()):
+        sim = simulation
+        task = Task()
+        self.task = task
+
+        def run():
+            task.resume.wait()
+            task.resume.clear()
+            try:
+                sim.resumed(task)
+                callback(*args)
+            except ThreadStop:
+                pass
+            except BaseException as exc:
+                sim.failure = exc
+            sim.finish(task)
+
+        sim.tasks.append(task)
+        sim.schedule(task, sim.now)
+        threading.Thread(target=run, daemon=True).start()
+
+    def stop(self):
+        self.task.stopped = True
+
+    @staticmethod
+    def sleep_for(duration, units=MSEC):
+        wait(duration, units)
+
+
+# ---------------------------------------------------------------------------- #
+#   Brain                                                                      #
+# ---------------------------------------------------------------------------- #
+
+class Timer:
+    def __init__(self):
+        self.start = simulation.now
+
+    def time(self, units=MSEC):
+        simulation.charge("timer")
+        elapsed = simulation.now - self.start
+        return elapsed if units == SECONDS else elapsed * 1000
+
+    def value(self):
+        return self.time(SECONDS)
+
+    def clear(self):
+        simulation.charge("timer")
+        self.start = simulation.now
+
+    def reset(self):
+        self.clear()
+
+    def system(self):
+        simulation.charge("timer")
+        return int(simulation.now * 1000)
+
+    def system_high_res(self):
+        simulation.charge("timer")
+        return int(simulation.now * 1000000)
+
+
+class Screen:
+    ROWS = 12
+    COLUMNS = 48
+
+    def __init__(self):
+        self.lines = [[" "] * self.COLUMNS for _ in range(self.ROWS)]
+        self.cursorRow = 1
+        self.cursorCol = 1
+
+    def text(self):
+        return "\n".join("".join(line).rstrip() for line in self.lines).rstrip()
+
+    def set_cursor(self, row, col):
+        simulation.charge("cursor")
+        self.cursorRow = int(row)
+        self.cursorCol = int(col)
+
+    def column(self):
+        return self.cursorCol
+
+    def row(self):
+        return self.cursorRow
+
+    def print(self, *args, sep=" ", precision=2):
+        simulation.charge("print")
+        parts = []
+        for arg in args:
+            if isinstance(arg, float):
+                parts.append("%.*f" % (precision, arg))
+            else:
+                parts.append(str(arg))
+        for char in sep.join(parts):
+            if 1 <= self.cursorRow <= self.ROWS and 1 <= self.cursorCol <= self.COLUMNS:
+                self.lines[self.cursorRow - 1][self.cursorCol - 1] = char
+            self.cursorCol += 1
+
+    def new_line(self):
+        simulation.charge("cursor")
+        self.cursorRow += 1
+        self.cursorCol = 1
+
+    next_row = new_line
+
+    def clear_screen(self, color=None):
+        simulation.charge("print")
+        self.lines = [[" "] * self.COLUMNS for _ in range(self.ROWS)]
+        self.cursorRow = 1
+        self.cursorCol = 1
+
+    def clear_row(self, row=None, color=None):
+        simulation.charge("print")
+        row = self.cursorRow if row is None else int(row)
+        if 1 <= row <= self.ROWS:
+            self.lines[row - 1] = [" "] * self.COLUMNS
+
+    def set_font(self, font):
+        pass
+
+    def set_pen_color(self, color):
+        pass
+
+    def set_fill_color(self, color):
+        pass
+
+    def draw_line(self, *args):
+        simulation.charge("print")
+
+    def draw_rectangle(self, *args):
+        simulation.charge("print")
+
+    def draw_circle(self, *args):
+        simulation.charge("print")
+
+    def render(self):
+        return True
+
+
+class Battery:
+    def voltage(self, units=VOLT):
+        simulation.charge("read")
+        volts = simulation.chassis.battery.voltage()
+        return volts * 1000 if units == MV else volts
+
+    def current(self, units=AMP):
+        simulation.charge("read")
+        return simulation.chassis.battery.current
+
+    def capacity(self):
+        simulation.charge("read")
+        return simulation.chassis.battery.capacity()
+
+
+class ThreeWirePort:
+    def __init__(self, letter):
+        self.letter = letter
+
+
+class ThreeWire:
+    def __init__(self):
+        for letter in "abcdefgh":
+            setattr(self, letter, ThreeWirePort(letter))
+
+
+class SdCard:
+    """Files live in simulation.files for the runner to save or inspect."""
+
+    def is_inserted(self):
+        return True
+
+    def exists(self, filename):
+        return filename in simulation.files
+
+    def filesize(self, filename):
+        return len(simulation.files.get(filename, b""))
+
+    def size(self, filename):
+        return self.filesize(filename)
+
+    def loadfile(self, filename):
+        simulation.charge("sdcard")
+        return bytearray(simulation.files.get(filename, b""))
+
+    def savefile(self, filename, buffer):
+        simulation.charge("sdcard")
+        simulation.advance(len(buffer) * SDCARD_BYTE_COST)
+        simulation.files[filename] = bytes(buffer)
+        return len(buffer)
+
+    def appendfile(self, filename, buffer):
+        simulation.charge("sdcard")
+        simulation.advance(len(buffer) * SDCARD_BYTE_COST)
+        simulation.files[filename] = simulation.files.get(filename, b"") + bytes(buffer)
+        return len(buffer)
+
+
+class Brain:
+    def __init__(self):
+        self.screen = Screen()
+        self.timer = Timer()
+        self.battery = Battery()
+        self.sdcard = SdCard()
+        self.three_wire_port = ThreeWire()
+        simulation.brain = self
+
+    def program_stop(self):
+        raise MissionComplete()
+
+
+# ---------------------------------------------------------------------------- #
+#   Smart devices                                                              #
+# ---------------------------------------------------------------------------- #
+
+class Motor:
+    def __init__(self, port, gears=GearSetting.RATIO_18_1, reverse=False):
+        self.port = port
+        self.model = simulation.motorModel(port)
+        self.model.rpm = chassis.CARTRIDGE_RPM[gears]
+        self.model.reversed = reverse
+        self.velocityPercent = 50.0
+        self.offset = 0.0
+        self.reported = (0.0, 0.0)      # (angle, rpm) at the last update
+        self.nextSample = 0.0
+        simulation.register(self)
+
+    def sample(self, now):
+        if now >= self.nextSample:
+            self.reported = (self.model.angle, self.model.speed)
+            model = simulation.chassis
+            if simulation.trace is not None and self.model in (model.right, model.left):
+                # Read back exactly what the robot read, whatever the offset
+                role = "right" if self.model is model.right else "left"
+                values = simulation.traced()
+                self.reported = (values[role] - self.offset, values[role + "Rate"] / 6)
+            self.nextSample = now + MOTOR_PERIOD
+
+    def rpmFrom(self, value, units):
+        if units == RPM:
+            return value
+        if units == DPS:
+            return value / 6
+        return value * self.model.rpm / 100
+
+    def set_velocity(self, value, units=PERCENT):
+        simulation.charge("command")
+        simulation.capture(self.model, "set_velocity", value, units)
+        self.velocityPercent = self.rpmFrom(value, units) * 100 / self.model.rpm
+
+    def set_stopping(self, mode):
+        simulation.charge("command")
+        self.model.stopping = mode
+
+    def set_max_torque(self, value, units=PERCENT):
+        simulation.charge("command")
+
+    def set_timeout(self, value, units=MSEC):
+        pass
+
+    def spin(self, direction, velocity=None, units=PERCENT):
+        simulation.charge("command")
+        simulation.capture(self.model, "spin", direction, velocity, units)
+        sign = 1 if direction == FORWARD else -1
+        if units in (VOLT, MV):
+            volts = velocity / 1000 if units == MV else velocity
+            self.model.mode = "voltage"
+            self.model.target = sign * volts
+            return
+        if velocity is not None:
+            self.velocityPercent = self.rpmFrom(velocity, units) * 100 / self.model.rpm
+        self.model.mode = "velocity"
+        self.model.target = sign * self.velocityPercent * self.model.rpm / 100
+
+    def spin_for(self, direction, value, units=DEGREES, velocity=None,
+                 units_v=PERCENT, wait=True):
+        start = self.position(DEGREES)
+        distance = abs(toDegrees(value, units))
+        self.spin(direction, velocity, units_v)
+        if wait:
+            while abs(self.position(DEGREES) - start) < distance:
+                simulation.advance(MOTOR_PERIOD)
+            self.stop()
+        return True
+
+    def stop(self, mode=None):
+        simulation.charge("command")
+        simulation.capture(self.model, "stop", mode)
+        if mode is not None:
+            self.model.stopping = mode
+        self.model.mode = "stop"
+        self.model.target = 0.0
+        self.model.holdAngle = self.model.angle
+
+    def set_position(self, value, units=DEGREES):
+        simulation.charge("command")
+        self.offset = toDegrees(value, units) - self.reported[0]
+
+    def reset_position(self):
+        self.set_position(0, DEGREES)
+
+    def position(self, units=DEGREES):
+        simulation.charge("read")
+        return fromDegrees(self.reported[0] + self.offset, units)
+
+    def velocity(self, units=RPM):
+        simulation.charge("read")
+        rpm = self.reported[1]
+        if units == PERCENT:
+            return rpm * 100 / self.model.rpm
+        return rpm * 6 if units == DPS else rpm
+
+    def current(self, units=AMP):
+        simulation.charge("read")
+        return self.model.current()
+
+    def voltage(self, units=VOLT):
+        simulation.charge("read")
+        return self.model.volts * 1000 if units == MV else self.model.volts
+
+    def power(self):
+        simulation.charge("read")
+        return abs(self.model.volts * self.model.current())
+
+    def torque(self):
+        simulation.charge("read")
+        return 0.0
+
+    def temperature(self, units=PERCENT):
+        simulation.charge("read")
+        return 30.0
+
+    def is_spinning(self):
+        simulation.charge("read")
+        return self.model.mode != "stop" or self.reported[1] != 0
+
+    def is_done(self):
+        return not self.is_spinning()
+
+
+class Rotation:
+    def __init__(self, port, reverse=False):
+        self.port = port
+        self.sign = -1 if reverse else 1
+        self.attached = port == simulation.wiring["liftRotation"]
+        self.offset = 0.0
+        self.reported = (0.0, 0.0)      # (arm degrees, arm rpm)
+        self.nextSample = 0.0
+        simulation.register(self)
+
+    def sample(self, now):
+        if self.attached and now >= self.nextSample:
+            model = simulation.chassis
+            rpm = model.lift.speed * model.lift.sign() / chassis.LIFT_RATIO
+            self.reported = (model.armAngle * self.sign, rpm * self.sign)
+            if simulation.trace is not None:
+                values = simulation.traced()
+                self.reported = (values["lift"] - self.offset, values["liftRate"] / 6)
+            self.nextSample = now + MOTOR_PERIOD
+
+    def position(self, units=DEGREES):
+        simulation.charge("read")
+        return fromDegrees(self.reported[0] + self.offset, units)
+
+    def angle(self, units=DEGREES):
+        return self.position(DEGREES) % 360 if units == DEGREES else self.position(units) % 1
+
+    def velocity(self, units=RPM):
+        simulation.charge("read")
+        return self.reported[1] * 6 if units == DPS else self.reported[1]
+
+    def set_position(self, value, units=DEGREES):
+        simulation.charge("command")
+        self.offset = toDegrees(value, units) - self.reported[0]
+
+    def reset_position(self):
+        self.set_position(0, DEGREES)
+
+
+class Inertial:
+    CALIBRATION_TIME = 2.0
+
+    def __init__(self, port):
+        self.port = port
+        self.attached = port == simulation.wiring["inertial"]
+        self.headingOffset = 0.0
+        self.rotationOffset = 0.0
+        self.calibratedUntil = 0.0
+        self.reported = (0.0, 0.0)      # (clockwise degrees, clockwise dps)
+        self.nextSample = 0.0
+        simulation.register(self)
+
+    def sample(self, now):
+        if self.attached and now >= self.nextSample:
+            model = simulation.chassis
+            noise = model.noise(chassis.GYRO_NOISE)
+            self.reported = (model.heading() + noise, -math.degrees(model.omega))
+            if simulation.trace is not None:
+                values = simulation.traced()
+                self.reported = (values["rotation"] - self.rotationOffset, values["rotationRate"])
+            self.nextSample = now + INERTIAL_PERIOD
+
+    def calibrate(self):
+        simulation.charge("command")
+        self.calibratedUntil = simulation.now + self.CALIBRATION_TIME
+        simulation.chassis.gyroBias = 0.0
+        self.headingOffset = -simulation.chassis.heading()
+        self.rotationOffset = self.headingOffset
+
+    def is_calibrating(self):
+        simulation.charge("read")
+        return simulation.now < self.calibratedUntil
+
+    def installed(self):
+        return self.attached
+
+    def rotation(self, units=DEGREES):
+        simulation.charge("read")
+        return self.reported[0] + self.rotationOffset
+
+    def heading(self, units=DEGREES):
+        simulation.charge("read")
+        return (self.reported[0] + self.headingOffset) % 360
+
+    def set_heading(self, value, units=DEGREES):
+        simulation.charge("command")
+        self.headingOffset = value - self.reported[0]
+
+    def set_rotation(self, value, units=DEGREES):
+        simulation.charge("command")
+        self.rotationOffset = value - self.reported[0]
+
+    def reset_heading(self):
+        self.set_heading(0)
+
+    def reset_rotation(self):
+        self.set_rotation(0)
+
+    def gyro_rate(self, axis=ZAXIS, units=DPS):
+        simulation.charge("read")
+        return self.reported[1] if axis == ZAXIS else 0.0
+
+    def orientation(self, axis=YAW, units=DEGREES):
+        simulation.charge("read")
+        if axis != YAW:
+            return 0.0
+        yaw = (self.reported[0] + self.headingOffset) % 360
+        return yaw - 360 if yaw > 180 else yaw
+
+    def acceleration(self, axis=XAXIS):
+        simulation.charge("read")
+        return 0.0
+
+
+class Bumper:
+    def __init__(self, port):
+        self.port = port
+        self.attached = getattr(port, "letter", None) == simulation.wiring["bumper"]
+
+    def pressing(self):
+        simulation.charge("read")
+        return self.attached and simulation.bumperPoll()